@@ -1,10 +1,21 @@
+import os
 import pandas as pd
 import matplotlib.pyplot as plt
 
+# Metrics plotted next to runtime: (column, axis label)
+METRICS = [
+    ("visited_nodes", "Expanded Nodes"),
+    ("heap_ops", "Heap Operations"),
+    ("peak_kb", "Peak Memory (KB)"),
+    ("path_len", "Path Length"),
+    ("gap_pct", "Optimality Gap (%)"),
+]
+
 def main():
     try:
         # Read file CSV 
         df = pd.read_csv("results.csv")
+        os.makedirs("../plots", exist_ok=True)
         
         # Calculate the average time based on the grid size (n) and the algorithm
         avg_times = df.groupby(['algo', 'n'])['time_ms'].mean().unstack(level=0)
@@ -24,6 +35,39 @@ def main():
         # Save the image (into the plots folder in the parent directory)
         plt.savefig("../plots/runtime_comparison.png")
         print("The graph was saved as 'plots/runtime_comparison.png'")
+
+        # Other metrics, one panel each (peak memory only exists for benchmark runs)
+        metrics = [(col, label) for col, label in METRICS if col in df and df[col].notna().any()]
+        if metrics:
+            fig, axes = plt.subplots(1, len(metrics), figsize=(5 * len(metrics), 5), squeeze=False)
+            for ax, (col, label) in zip(axes[0], metrics):
+                avg = df.groupby(['algo', 'n'])[col].mean().unstack(level=0)
+                for algo in avg.columns:
+                    ax.plot(avg.index, avg[algo], marker='o', label=algo)
+                ax.set_title(label)
+                ax.set_xlabel("Grid Size (NxN)")
+                ax.grid(True)
+            axes[0][0].legend()
+            fig.tight_layout()
+            fig.savefig("../plots/metrics_comparison.png")
+            print("The graph was saved as 'plots/metrics_comparison.png'")
+
+        # With several map families (--families): runtime per family, one panel each
+        if "family" in df and df["family"].nunique() > 1:
+            families = list(df["family"].unique())
+            fig, axes = plt.subplots(1, len(families), figsize=(5 * len(families), 5), squeeze=False)
+            for ax, family in zip(axes[0], families):
+                avg = df[df["family"] == family].groupby(['algo', 'n'])['time_ms'].mean().unstack(level=0)
+                for algo in avg.columns:
+                    ax.plot(avg.index, avg[algo], marker='o', label=algo)
+                ax.set_title(f"Time (ms), {family}")
+                ax.set_xlabel("Grid Size (NxN)")
+                ax.grid(True)
+            axes[0][0].legend()
+            fig.tight_layout()
+            fig.savefig("../plots/family_comparison.png")
+            print("The graph was saved as 'plots/family_comparison.png'")
+
         plt.show()
 
     except FileNotFoundError:
@@ -1,151 +1,283 @@
+import os
+import sys
+import gc
 import time
-import random
+import json
 import csv
-import heapq
-from collections import deque
-
-# --- ALGORITHMS LOGICS (Without Images) ---
-
-def heuristic(p1, p2):
-    return abs(p1[0] - p2[0]) + abs(p1[1] - p2[1])
-
-def get_neighbors(node, grid_size, barriers):
-    r, c = node
-    neighbors = []
-    # Aşağı, Yukarı, Sağ, Sol
-    directions = [(r+1, c), (r-1, c), (r, c+1), (r, c-1)]
-    for nr, nc in directions:
-        if 0 <= nr < grid_size and 0 <= nc < grid_size:
-            if (nr, nc) not in barriers:
-                neighbors.append((nr, nc))
-    return neighbors
-
-def run_astar(grid_size, start, end, barriers):
-    count = 0
-    open_set = []
-    heapq.heappush(open_set, (0, count, start))
-    came_from = {}
-    
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, end)}
-    open_set_hash = {start}
-    
-    visited_count = 0
-
-    while open_set:
-        current = heapq.heappop(open_set)[2]
-        open_set_hash.remove(current)
-        visited_count += 1
-
-        if current == end:
-            return True, visited_count
-
-        for neighbor in get_neighbors(current, grid_size, barriers):
-            temp_g = g_score[current] + 1
-            if temp_g < g_score.get(neighbor, float('inf')):
-                came_from[neighbor] = current
-                g_score[neighbor] = temp_g
-                f_score[neighbor] = temp_g + heuristic(neighbor, end)
-                if neighbor not in open_set_hash:
-                    count += 1
-                    heapq.heappush(open_set, (f_score[neighbor], count, neighbor))
-                    open_set_hash.add(neighbor)
-    return False, visited_count
-
-def run_dijkstra(grid_size, start, end, barriers):
-    count = 0
-    open_set = []
-    heapq.heappush(open_set, (0, count, start))
-    dist = {start: 0}
-    visited_count = 0
-    open_set_hash = {start}
-
-    while open_set:
-        current = heapq.heappop(open_set)[2]
-        open_set_hash.remove(current)
-        visited_count += 1
-
-        if current == end:
-            return True, visited_count
-
-        for neighbor in get_neighbors(current, grid_size, barriers):
-            if dist[current] + 1 < dist.get(neighbor, float('inf')):
-                dist[neighbor] = dist[current] + 1
-                count += 1
-                if neighbor not in open_set_hash:
-                    heapq.heappush(open_set, (dist[neighbor], count, neighbor))
-                    open_set_hash.add(neighbor)
-    return False, visited_count
-
-def run_bfs(grid_size, start, end, barriers):
-    q = deque([start])
-    visited = {start}
-    visited_count = 0
-
-    while q:
-        current = q.popleft()
-        visited_count += 1
-        
-        if current == end:
-            return True, visited_count
-        
-        for neighbor in get_neighbors(current, grid_size, barriers):
-            if neighbor not in visited:
-                visited.add(neighbor)
-                q.append(neighbor)
-    return False, visited_count
+import argparse
+import statistics
+import tracemalloc
+import cProfile
+from concurrent.futures import ProcessPoolExecutor
+
+# The algorithms come from the same engine the visualizer runs (src/pathfinding)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+import numpy as np
+from pathfinding import ALGORITHMS, EMPTY, search, run, profiled, optimality_gap, release_context, hpa_for
+from pathfinding.mapfile import load_map, load_movingai, load_scenarios
+from pathfinding.components import ComponentIndex
+from pathfinding.landmarks import landmarks_for
+from pathfinding.generators import FAMILIES, grid_from_mask, random_costs
 
 # --- EXPERIMENTAL SETUP ---
 
-def generate_random_barriers(grid_size, probability=0.2):
-    barriers = set()
-    for r in range(grid_size):
-        for c in range(grid_size):
-            if random.random() < probability:
-                barriers.add((r, c))
-    return barriers
+def load_queries(path):
+    # Binary .pfm maps carry their own start/end; MovingAI .map files take
+    # their queries from the .map.scen file next to them, if there is one.
+    # Otherwise: first to last open cell.
+    if path.endswith(".map"):
+        grid = load_movingai(path)
+        scen = path + ".scen"
+        scenarios = load_scenarios(scen) if os.path.exists(scen) else []
+        queries = [(grid.index(*s), grid.index(*e)) for _, s, e, _ in scenarios]
+    else:
+        grid, s, e = load_map(path)
+        queries = [(s, e)] if s is not None and e is not None else []
+    if not queries:
+        queries = [(grid.cells.find(EMPTY), grid.cells.rfind(EMPTY))]
+    return grid, queries
+
+def trial_seed(seed, n, trial):
+    # Every (n, trial) gets its own stream, independent of which worker
+    # runs it or in what order, so maps are identical across runs
+    return [seed, n, trial]
+
+def measure(name, grid, s, e, warmup, repeat, memory, profile_file=None, components=None):
+    for _ in range(warmup):
+        search(name, grid, s, e, components)
+
+    # Timed repetitions with the garbage collector off, like timeit
+    times = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            st = time.perf_counter_ns()
+            result = search(name, grid, s, e, components)
+            times.append(time.perf_counter_ns() - st)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    # Peak memory from a separate run, tracemalloc slows the search down a lot.
+    # The run allocates its own search context (A*, Dijkstra, BFS, Dial),
+    # so that is counted just like the dicts of the other algorithms.
+    peak = None
+    if memory:
+        release_context(grid)
+        tracemalloc.start()
+        search(name, grid, s, e, components)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    # cProfile of one more run, also separate
+    if profile_file and not result.unreachable:
+        profile = cProfile.Profile()
+        run(profiled(ALGORITHMS[name](grid, s, e), profile))
+        profile.dump_stats(profile_file)
+    return result, times, peak
+
+def median_iqr(values):
+    if len(values) < 2:
+        return values[0], 0
+    q1, q2, q3 = statistics.quantiles(values, n=4)
+    return statistics.median(values), q3 - q1
+
+def profile_file(profile_dir, name, family, n, trial):
+    if not profile_dir:
+        return None
+    safe = name.replace("*", "star")
+    return os.path.join(profile_dir, f"{safe}_{family}_{n}_{trial}.prof")
+
+def measure_all(grid, s, e, n, trial, warmup, repeat, memory, profile_dir=None, components=True,
+                family="file"):
+    # With components, queries between walled-off parts of the map are
+    # answered from a ComponentIndex instead of flooding the start's part
+    index = ComponentIndex(grid) if components else None
+    # ALT's landmarks and HPA*'s abstract graph are built once per map,
+    # before timing; their build time is reported as preprocessing
+    preprocess = {"ALT": landmarks_for(grid).build_time, "HPA*": hpa_for(grid).build().build_time}
+    measured = {name: measure(name, grid, s, e, warmup, repeat, memory,
+                              profile_file(profile_dir, name, family, n, trial), index)
+                for name in ALGORITHMS}
+
+    # Path over the optimal A* path, nonzero only for approximate algorithms
+    # (HPA*) and, on weighted maps, for the ones that ignore terrain.
+    # Compared by length, or by terrain cost on weighted maps.
+    optimal = measured["A*"][0]
+    # Expanded nodes relative to A*, negative where a search expands fewer
+    baseline = optimal.visited
+    weighted = grid if grid.is_weighted() else None
+    rows = []
+    for name, (result, times, peak) in measured.items():
+        time_ns, iqr_ns = median_iqr(times)
+        heap_ops = result.pushes + result.pops + result.decrease_keys
+        rows.append([name, n, trial, time_ns / 1e6, iqr_ns / 1e6, result.visited,
+                     heap_ops, result.path_len, 100 * optimality_gap(result, optimal, weighted),
+                     "" if peak is None else peak / 1024, result.neighbor_checks, result.stale_pops,
+                     grid.path_cost(result.path), int(result.unreachable),
+                     preprocess.get(name, 0) * 1000,
+                     100 * (result.visited / baseline - 1) if baseline else 0, family,
+                     result.cluster_visited])
+    return rows
+
+def run_trial(n, trial, seed, warmup=0, repeat=1, memory=False, profile_dir=None, weighted=False,
+              components=True, family="random"):
+    # Runs in a worker: build the map once, measure every algorithm on it
+    rng = np.random.default_rng(trial_seed(seed, n, trial))
+    mask = FAMILIES[family](n, n, rng)
+
+    # Start ve End bariyer olmasın
+    mask[0, 0] = mask[-1, -1] = False
+
+    grid = grid_from_mask(mask)
+    if weighted:
+        random_costs(grid, rng)
+    s = 0
+    e = grid.size - 1
+
+    return measure_all(grid, s, e, n, trial, warmup, repeat, memory, profile_dir, components, family)
+
+def run_map_trial(path, trial, warmup=0, repeat=1, memory=False, profile_dir=None, components=True):
+    # Runs in a worker: trial-th query of a map file
+    grid, queries = load_queries(path)
+    s, e = queries[trial]
+    return measure_all(grid, s, e, os.path.basename(path), trial, warmup, repeat, memory, profile_dir,
+                       components)
+
+def summarize(rows):
+    # One entry per (algo, family, n) for the JSON summary
+    groups = {}
+    for row in rows:
+        groups.setdefault((row[0], row[16], row[1]), []).append(row)
+    summary = []
+    for (algo, family, n), group in groups.items():
+        time_ms, iqr_ms = median_iqr([row[3] for row in group])
+        peaks = [row[9] for row in group if row[9] != ""]
+        summary.append({
+            "algo": algo,
+            "family": family,
+            "n": n,
+            "trials": len(group),
+            "time_ms_median": time_ms,
+            "time_ms_iqr": iqr_ms,
+            "visited_nodes_mean": statistics.mean(row[5] for row in group),
+            "heap_ops_mean": statistics.mean(row[6] for row in group),
+            "path_len_mean": statistics.mean(row[7] for row in group),
+            "gap_pct_mean": statistics.mean(row[8] for row in group),
+            "gap_pct_max": max(row[8] for row in group),
+            "path_cost_mean": statistics.mean(row[12] for row in group),
+            "unreachable_pct": 100 * statistics.mean(row[13] for row in group),
+            "preprocess_ms_mean": statistics.mean(row[14] for row in group),
+            "expanded_vs_astar_pct_mean": statistics.mean(row[15] for row in group),
+            "neighbor_checks_mean": statistics.mean(row[10] for row in group),
+            "stale_pops_mean": statistics.mean(row[11] for row in group),
+            "peak_kb_max": max(peaks) if peaks else None,
+        })
+    return summary
 
 def main():
-    sizes = [20, 50, 100] # Farklı grid boyutları
-    trials = 10 # Her boyut için kaç deneme yapılsın
-    filename = "results.csv"
+    parser = argparse.ArgumentParser(description="Time every algorithm on seeded random maps.")
+    parser.add_argument("command", nargs="?", choices=["sweep", "benchmark"], default="sweep",
+                        help="sweep: one timed run per algorithm and map; "
+                             "benchmark: warmup, repetitions and peak memory")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 50, 100]) # Farklı grid boyutları
+    parser.add_argument("--trials", type=int, default=10) # Her boyut için kaç deneme yapılsın
+    parser.add_argument("--maps", nargs="+", metavar="FILE",
+                        help="run on map files (.pfm or MovingAI .map) instead of random "
+                             "maps; up to --trials queries per map")
+    parser.add_argument("--families", nargs="+", choices=list(FAMILIES), default=["random"],
+                        help="generated map families to run on (default: random)")
+    parser.add_argument("--weighted", action="store_true",
+                        help="random maps get random terrain costs (1-9 per cell)")
+    parser.add_argument("--no-components", action="store_true",
+                        help="search even when start and end are walled off from each other "
+                             "(by default a component index answers those without searching)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="worker processes (1 runs everything in this process)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="results.csv")
+    parser.add_argument("--warmup", type=int, default=2, help="benchmark: untimed runs first")
+    parser.add_argument("--repeat", type=int, default=7, help="benchmark: timed runs (median/IQR)")
+    parser.add_argument("--json", default="results.json", help="benchmark: summary file")
+    parser.add_argument("--profile", metavar="DIR",
+                        help="also write a cProfile file per algorithm and trial to DIR")
+    args = parser.parse_args()
+    if args.trials < 1:
+        parser.error("--trials must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    filename = args.output
+
+    benchmark = args.command == "benchmark"
+    warmup = args.warmup if benchmark else 0
+    repeat = args.repeat if benchmark else 1
     
     print("Experiments Starting... (This process may take a little time)")
 
+    if args.maps:
+        tasks = [(path, t) for path in args.maps
+                 for t in range(min(args.trials, len(load_queries(path)[1])))]
+        trial_fn = run_map_trial
+        extra = []
+    else:
+        tasks = [(f, n, t) for f in args.families for n in args.sizes for t in range(args.trials)]
+        trial_fn = run_trial
+        extra = [[args.seed] * len(tasks)]
+    ns = [task[-2] for task in tasks]
+    trials = [task[-1] for task in tasks]
+    extra += [[warmup] * len(tasks), [repeat] * len(tasks), [benchmark] * len(tasks),
+              [args.profile] * len(tasks)]
+    if not args.maps:
+        extra.append([args.weighted] * len(tasks))
+    extra.append([not args.no_components] * len(tasks))
+    if not args.maps:
+        extra.append([f for f, _, _ in tasks])
+    if args.profile:
+        os.makedirs(args.profile, exist_ok=True)
+    all_rows = []
+    unreachable = 0  # queries answered from the component index
+
     with open(filename, mode='w', newline='') as file:
         writer = csv.writer(file)
-        writer.writerow(["algo", "n", "trial", "time_ms", "visited_nodes"])
-
-        for n in sizes:
-            print(f"Grid size is being test: {n}x{n}")
-            for t in range(trials):
-                start = (0, 0)
-                end = (n-1, n-1)
-                barriers = generate_random_barriers(n)
-                
-                # Start ve End bariyer olmasın
-                if start in barriers: barriers.remove(start)
-                if end in barriers: barriers.remove(end)
-
-                # A*
-                st = time.time()
-                run_astar(n, start, end, barriers)
-                et = time.time()
-                writer.writerow(["A*", n, t, (et-st)*1000, 0]) 
-                
-                # Dijkstra
-                st = time.time()
-                run_dijkstra(n, start, end, barriers)
-                et = time.time()
-                writer.writerow(["Dijkstra", n, t, (et-st)*1000, 0])
-
-                # BFS
-                st = time.time()
-                run_bfs(n, start, end, barriers)
-                et = time.time()
-                writer.writerow(["BFS", n, t, (et-st)*1000, 0])
+        writer.writerow(["algo", "n", "trial", "time_ms", "iqr_ms", "visited_nodes",
+                         "heap_ops", "path_len", "gap_pct", "peak_kb", "neighbor_checks", "stale_pops", "path_cost", "unreachable", "preprocess_ms",
+                         "expanded_vs_astar_pct", "family", "cluster_visited"])
+
+        # map() hands results back in task order, so the CSV is written in the
+        # same order whatever the worker count
+        if args.workers == 1:
+            results = map(trial_fn, ns, trials, *extra)
+            executor = None
+        else:
+            executor = ProcessPoolExecutor(max_workers=args.workers)
+            results = executor.map(trial_fn, ns, trials, *extra)
+        try:
+            last_n = None
+            for task, rows in zip(tasks, results):
+                n = task[:-1]
+                if n != last_n:
+                    print(f"Map is being tested: {n[0]}" if args.maps else
+                          f"Grid size is being test: {n[1]}x{n[1]} ({n[0]})")
+                    last_n = n
+                writer.writerows(rows)
+                all_rows.extend(rows)
+                unreachable += rows[0][13]
+        finally:
+            if executor:
+                executor.shutdown()
     
     print(f"Experiment Completed! Results were saved to file '{filename}'")
+    print(f"Unreachable queries: {unreachable} of {len(tasks)}")
+    alt = [row for row in all_rows if row[0] == "ALT"]
+    if alt:
+        print(f"ALT: {statistics.mean(row[15] for row in alt):+.1f}% expanded nodes vs A*, "
+              f"{statistics.mean(row[14] for row in alt):.1f} ms preprocessing per map (mean)")
+
+    if benchmark:
+        with open(args.json, "w") as file:
+            json.dump(summarize(all_rows), file, indent=2)
+        print(f"Summary was saved to file '{args.json}'")
 
 if __name__ == "__main__":
 
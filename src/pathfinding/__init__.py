@@ -0,0 +1,16 @@
+# Headless search engine shared by the visualizer (src/main.py) and the
+# experiment runner (experiments/run_experiments.py). No pygame in here.
+from .grid import Grid, EMPTY, BARRIER, START, END, OPEN, CLOSED, PATH, MIN_COST, MAX_COST
+from .algorithms import (
+    SearchResult, run,
+    astar, dijkstra, bfs, astar_steps, dijkstra_steps, bfs_steps,
+)
+from .heaps import IndexedHeap, PairingHeap, LazyHeap, BucketQueue, QUEUES
+from .context import SearchContext, search_context, release_context
+from .jps import jps_steps
+from .bidirectional import bidirectional_bfs_steps, bidirectional_astar_steps
+from .incremental import LPAStar, lpa_star_steps
+from .hierarchical import HPAStar, hpa_for, hpa_star_steps, optimality_gap
+from .instrument import timed, profiled
+from .registry import ALGORITHMS, search, dial_steps, dial_astar_steps, alt_steps
+from .cache import PathCache, shortest_path_tree
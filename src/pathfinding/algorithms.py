@@ -0,0 +1,236 @@
+from collections import deque
+
+from .heaps import IndexedHeap
+from .context import search_context
+
+# --- RESULT ---
+
+class SearchResult:
+    def __init__(self):
+        self.found = False
+        self.path = []      # cell indices from start to end
+        self.visited = 0    # expanded (popped) nodes
+        self.neighbor_checks = 0  # neighbors looked at while expanding
+        # HPA* only: cells expanded by in-cluster searches (linking start and
+        # end, building clusters, refining the path), not part of visited
+        self.cluster_visited = 0
+        # Priority queue counters (A*/Dijkstra only)
+        self.pushes = 0
+        self.pops = 0
+        self.decrease_keys = 0
+        self.stale_pops = 0
+        # Answered "no path" from a ComponentIndex, without searching
+        self.unreachable = False
+        # Answered by a PathCache (cache.py), without searching
+        self.cached = False
+
+    def count_queue(self, *queues):
+        self.pushes = sum(q.pushes for q in queues)
+        self.pops = sum(q.pops for q in queues)
+        self.decrease_keys = sum(q.decrease_keys for q in queues)
+        self.stale_pops = sum(q.stale_pops for q in queues)
+
+    def as_dict(self):
+        # Counters for JSON export (the path itself is left out)
+        return {
+            "found": self.found,
+            "path_len": self.path_len,
+            "visited": self.visited,
+            "cluster_visited": self.cluster_visited,
+            "neighbor_checks": self.neighbor_checks,
+            "pushes": self.pushes,
+            "pops": self.pops,
+            "decrease_keys": self.decrease_keys,
+            "stale_pops": self.stale_pops,
+            "unreachable": self.unreachable,
+            "cached": self.cached,
+        }
+
+    @property
+    def path_len(self):
+        # Number of steps, like the old reconstruct_path counter
+        return len(self.path) - 1 if self.path else 0
+
+
+def h(grid, a, b):
+    ar, ac = divmod(a, grid.cols)
+    br, bc = divmod(b, grid.cols)
+    return abs(ar - br) + abs(ac - bc)
+
+# --- ALGORITHMS ---
+# Every algorithm is a generator over (grid, start, end) as cell indices.
+# It yields (current, opened) after each expansion, where opened lists the
+# cells pushed to the frontier in that step, and returns a SearchResult.
+# run() drains one without looking at the steps.
+#
+# A*, Dijkstra and BFS keep their per-cell state in a SearchContext
+# (context.py), by default the one cached for the grid; pass context= to
+# run searches on the same grid interleaved.
+
+
+def manhattan(grid, end):
+    # h(i) towards end, as a function of the cell alone
+    cols = grid.cols
+    er, ec = divmod(end, cols)
+
+    def heuristic(i):
+        r, c = divmod(i, cols)
+        return abs(r - er) + abs(c - ec)
+    return heuristic
+
+
+def astar_steps(grid, start, end, queue=IndexedHeap, context=None, heuristic=None):
+    # heuristic: cell -> lower bound on the cost to end, Manhattan by
+    # default. It has to be consistent (expanded cells are never reopened).
+    result = SearchResult()
+    offsets, adjacency, costs = grid.offsets, grid.adjacency, grid.costs
+    heuristic = heuristic or manhattan(grid, end)
+    context = context or search_context(grid)
+    generation = context.begin()
+    done = generation + 1  # stamp of expanded cells
+    stamp, g_score, came_from = context.stamp, context.g, context.parent
+    open_set = queue()
+    open_set.push(start, heuristic(start))
+    stamp[start] = generation
+    g_score[start] = 0
+
+    while open_set:
+        current, _ = open_set.pop()
+        result.visited += 1
+        stamp[current] = done
+
+        if current == end:
+            result.found = True
+            result.path = context.path(start, end)
+            result.count_queue(open_set)
+            return result
+
+        opened = []
+        g = g_score[current]
+        dirs = offsets[adjacency[current]]
+        result.neighbor_checks += len(dirs)
+        for d in dirs:
+            neighbor = current + d
+            # The heuristic is consistent, expanded cells are final
+            seen = stamp[neighbor]
+            if seen == done:
+                continue
+            # Entering a cell costs its terrain cost (1 on unweighted maps)
+            temp_g_score = g + costs[neighbor]
+            if seen != generation or temp_g_score < g_score[neighbor]:
+                stamp[neighbor] = generation
+                came_from[neighbor] = current
+                g_score[neighbor] = temp_g_score
+                if neighbor not in open_set:
+                    opened.append(neighbor)
+                # Inserts, or decreases the key of an already queued neighbor
+                open_set.push(neighbor, temp_g_score + heuristic(neighbor))
+
+        yield current, opened
+        context.check(generation)
+    result.count_queue(open_set)
+    return result
+
+
+def dijkstra_steps(grid, start, end, queue=IndexedHeap, context=None):
+    result = SearchResult()
+    offsets, adjacency, costs = grid.offsets, grid.adjacency, grid.costs
+    context = context or search_context(grid)
+    generation = context.begin()
+    done = generation + 1  # stamp of expanded cells
+    stamp, dist, came_from = context.stamp, context.g, context.parent
+    open_set = queue()
+    open_set.push(start, 0)
+    stamp[start] = generation
+    dist[start] = 0
+
+    while open_set:
+        current, _ = open_set.pop()
+        result.visited += 1
+        stamp[current] = done
+
+        if current == end:
+            result.found = True
+            result.path = context.path(start, end)
+            result.count_queue(open_set)
+            return result
+
+        opened = []
+        d_current = dist[current]
+        dirs = offsets[adjacency[current]]
+        result.neighbor_checks += len(dirs)
+        for d in dirs:
+            neighbor = current + d
+            seen = stamp[neighbor]
+            if seen == done:
+                continue
+            new_dist = d_current + costs[neighbor]
+            if seen != generation or new_dist < dist[neighbor]:
+                stamp[neighbor] = generation
+                dist[neighbor] = new_dist
+                came_from[neighbor] = current
+                if neighbor not in open_set:
+                    opened.append(neighbor)
+                open_set.push(neighbor, new_dist)
+
+        yield current, opened
+        context.check(generation)
+    result.count_queue(open_set)
+    return result
+
+
+def bfs_steps(grid, start, end, context=None):
+    result = SearchResult()
+    offsets, adjacency = grid.offsets, grid.adjacency
+    context = context or search_context(grid)
+    generation = context.begin()
+    # Queued once is final in BFS, reached is as good as expanded
+    stamp, came_from = context.stamp, context.parent
+    q = deque([start])
+    stamp[start] = generation
+
+    while q:
+        current = q.popleft()
+        result.visited += 1
+
+        if current == end:
+            result.found = True
+            result.path = context.path(start, end)
+            return result
+
+        opened = []
+        dirs = offsets[adjacency[current]]
+        result.neighbor_checks += len(dirs)
+        for d in dirs:
+            neighbor = current + d
+            if stamp[neighbor] != generation:
+                came_from[neighbor] = current
+                stamp[neighbor] = generation
+                q.append(neighbor)
+                opened.append(neighbor)
+
+        yield current, opened
+        context.check(generation)
+    return result
+
+
+def run(steps):
+    # Drain a step generator and hand back its SearchResult
+    try:
+        while True:
+            next(steps)
+    except StopIteration as stop:
+        return stop.value
+
+
+def astar(grid, start, end, queue=IndexedHeap, context=None, heuristic=None):
+    return run(astar_steps(grid, start, end, queue, context, heuristic))
+
+
+def dijkstra(grid, start, end, queue=IndexedHeap, context=None):
+    return run(dijkstra_steps(grid, start, end, queue, context))
+
+
+def bfs(grid, start, end, context=None):
+    return run(bfs_steps(grid, start, end, context))
+
@@ -0,0 +1,175 @@
+import os
+import time
+import multiprocessing
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.shared_memory import SharedMemory
+
+from .grid import Grid
+from .registry import search
+from .cache import shortest_path_tree, tree_path
+from .components import ComponentIndex
+
+# --- BATCH QUERIES ---
+# Many (start, end) queries on one map at once. Queries are grouped by
+# start: a start with several ends gets one Dijkstra that stops once all of
+# them are settled (cache.shortest_path_tree) and every end is a walk up
+# its parent pointers; a start with a single end gets an A* search. Both
+# return cost-optimal paths. Queries between different components are
+# answered from a ComponentIndex without searching.
+#
+# With workers > 1 the groups run on a process pool. The map goes to the
+# workers once, through shared memory (cells and costs, one byte each per
+# cell), when the pool starts; after that only the groups and the paths
+# travel. So one BatchSolver serves any number of batches on a map that
+# doesn't change (build a new one after edits):
+#
+#   with BatchSolver(grid, workers=4) as solver:
+#       paths, stats = solver.solve([(s1, e1), (s1, e2), (s2, e3)])
+#
+# stats reports throughput (queries/s) and per-query latency, the time
+# from the start of the batch until the group of a query was done, as p50
+# and p99. Starting the workers is not part of any batch: the constructor
+# waits until all of them are up and reports that as startup_s. Needs
+# numpy (`from pathfinding.batch import BatchSolver`).
+
+CHUNKS = 4  # tasks per worker, so one slow group doesn't hold up the rest
+
+_grid = None  # the worker's copy of the map
+
+
+def _attach(name, rows, cols):
+    # Pool initializer: rebuild the map from shared memory
+    global _grid
+    shm = SharedMemory(name=name)
+    size = rows * cols
+    _grid = Grid(rows, cols, bytearray(shm.buf[:size]), bytearray(shm.buf[size:2 * size]))
+    shm.close()
+
+
+def _ready():
+    return os.getpid()
+
+
+def solve_group(grid, start, ends):
+    # Paths from start to every end, as arrays of cell indexes
+    if len(ends) == 1:
+        return [array("i", search("A*", grid, start, ends[0]).path)]
+    parent, _ = shortest_path_tree(grid, start, ends)
+    return [array("i", tree_path(parent, end)) for end in ends]
+
+
+def _solve_chunk(chunk):
+    return [solve_group(_grid, start, ends) for start, ends in chunk]
+
+
+def percentile(values, p):
+    # Nearest-rank percentile of a list of numbers, 0 if empty
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, round(p / 100 * len(values)) - 1))]
+
+
+class BatchSolver:
+    def __init__(self, grid, workers=None):
+        st = time.perf_counter()
+        self.grid = grid
+        self.workers = workers or os.cpu_count()
+        self.components = ComponentIndex(grid)
+        self.shm = None
+        self.pool = None
+        if self.workers > 1:
+            size = grid.size
+            self.shm = SharedMemory(create=True, size=2 * size)
+            # Not in a with block yet: if startup fails, close() here so
+            # the shared memory doesn't outlive the process
+            try:
+                self.shm.buf[:size] = grid.cells
+                self.shm.buf[size:2 * size] = grid.costs
+                # Spawned, not forked: a forked worker would also inherit the
+                # caller's open files and sockets (the service's connections)
+                self.pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                mp_context=multiprocessing.get_context("spawn"),
+                                                initializer=_attach,
+                                                initargs=(self.shm.name, grid.rows, grid.cols))
+                # Workers are started on demand, one per task while none is
+                # idle: one task each starts them all, before the first batch
+                for task in [self.pool.submit(_ready) for _ in range(self.workers)]:
+                    task.result()
+            except BaseException:
+                self.close()
+                raise
+        self.startup = time.perf_counter() - st
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def solve(self, queries):
+        # queries: list of (start, end) cell indexes. Returns a path per
+        # query (array of cell indexes, empty if there is none) and stats.
+        st = time.perf_counter()
+        paths = [array("i") for _ in queries]
+        latencies = [0.0] * len(queries)
+        groups = {}  # start -> (ends, query numbers)
+        connected = self.components.connected
+        for k, (start, end) in enumerate(queries):
+            if start == end:
+                paths[k] = array("i", [start]) if connected(start, end) else array("i")
+            elif connected(start, end):
+                ends, numbers = groups.setdefault(start, ([], []))
+                ends.append(end)
+                numbers.append(k)
+
+        # Biggest groups first, dealt round-robin, so the chunks come out
+        # about equally heavy. In-process every group is its own chunk.
+        order = sorted(groups.items(), key=lambda item: -len(item[1][0]))
+        count = len(order) if self.pool is None else min(len(order), self.workers * CHUNKS)
+        chunks = [order[c::count] for c in range(count)]
+
+        def collect(chunk, results):
+            done = time.perf_counter() - st
+            for (start, (ends, numbers)), group in zip(chunk, results):
+                for k, path in zip(numbers, group):
+                    paths[k] = path
+                    latencies[k] = done
+
+        if self.pool is None:
+            for chunk in chunks:
+                collect(chunk, [solve_group(self.grid, start, ends) for start, (ends, _) in chunk])
+        else:
+            tasks = {self.pool.submit(_solve_chunk, [(start, ends) for start, (ends, _) in chunk]): chunk
+                     for chunk in chunks}
+            for task in as_completed(tasks):
+                collect(tasks[task], task.result())
+        seconds = time.perf_counter() - st
+        stats = {
+            "queries": len(queries),
+            "groups": len(groups),
+            "searched": sum(len(ends) for ends, _ in groups.values()),
+            "workers": self.workers,
+            "startup_s": self.startup,
+            "seconds": seconds,
+            "qps": len(queries) / seconds if seconds else 0,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+        }
+        return paths, stats
+
+
+def solve_batch(grid, queries, workers=1):
+    # One-off batch; keep a BatchSolver for more than one on the same map
+    with BatchSolver(grid, workers) as solver:
+        return solver.solve(queries)
@@ -0,0 +1,125 @@
+from .heaps import IndexedHeap
+from .algorithms import SearchResult, h
+
+# --- BIDIRECTIONAL SEARCH ---
+# Both searches grow one frontier from start and one from end and stop when
+# they meet, so a long query explores two small balls instead of one big
+# one. Side 0 searches forward from start, side 1 backward from end; both
+# yield (current, opened) per expansion like the other step generators.
+
+
+def _join(parents, meet):
+    # start .. meet from the forward tree, meet .. end from the backward one
+    path = []
+    node = meet
+    while node is not None:
+        path.append(node)
+        node = parents[0][node]
+    path.reverse()
+    node = parents[1][meet]
+    while node is not None:
+        path.append(node)
+        node = parents[1][node]
+    return path
+
+
+def bidirectional_bfs_steps(grid, start, end):
+    result = SearchResult()
+    parents = ({start: None}, {end: None})
+    dist = ({start: 0}, {end: 0})
+    frontiers = [[start], [end]]
+    if start == end:
+        result.found = True
+        result.path = [start]
+        return result
+
+    meet = None
+    best = float("inf")
+    while frontiers[0] and frontiers[1] and meet is None:
+        # Expand one whole layer of the smaller frontier. Finishing the
+        # layer before stopping keeps the meeting point optimal.
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        mine, theirs = dist[side], dist[1 - side]
+        parent = parents[side]
+        next_frontier = []
+        for current in frontiers[side]:
+            result.visited += 1
+            new_dist = mine[current] + 1
+            opened = []
+            neighbors = grid.neighbors(current)
+            result.neighbor_checks += len(neighbors)
+            for neighbor in neighbors:
+                if neighbor in mine:
+                    continue
+                mine[neighbor] = new_dist
+                parent[neighbor] = current
+                next_frontier.append(neighbor)
+                opened.append(neighbor)
+                if neighbor in theirs and new_dist + theirs[neighbor] < best:
+                    best = new_dist + theirs[neighbor]
+                    meet = neighbor
+            yield current, opened
+        frontiers[side] = next_frontier
+
+    if meet is not None:
+        result.found = True
+        result.path = _join(parents, meet)
+    return result
+
+
+def bidirectional_astar_steps(grid, start, end, queue=IndexedHeap):
+    # Forward A* from start and backward A* from end, always expanding the
+    # side with the smaller open set. Each side uses the balanced heuristic
+    # (distance to its target minus distance to its source) / 2: with plain
+    # Manhattan both sides run almost all the way to the other end, on
+    # mazes more than one A* would. The two heuristics sum to zero, so both
+    # searches rank nodes by the same reduced edge costs (Ikeda et al.)
+    # and, as in bidirectional Dijkstra, no undiscovered path is cheaper
+    # than the two smallest keys added up: once that reaches best, the
+    # cheapest start-end path seen where the two searches touch, we stop.
+    result = SearchResult()
+    ends = ((start, end), (end, start))  # (source, target) per side
+    open_sets = (queue(), queue())
+    g_score = ({start: 0}, {end: 0})
+    parents = ({start: None}, {end: None})
+
+    def balanced(node, source, target):
+        return (h(grid, node, target) - h(grid, node, source)) / 2
+
+    open_sets[0].push(start, balanced(start, start, end))
+    open_sets[1].push(end, balanced(end, end, start))
+
+    meet = start if start == end else None
+    best = 0 if meet is not None else float("inf")
+    while open_sets[0] and open_sets[1]:
+        if open_sets[0].top()[1] + open_sets[1].top()[1] >= best:
+            break
+        side = 0 if len(open_sets[0]) <= len(open_sets[1]) else 1
+        open_set, mine, theirs = open_sets[side], g_score[side], g_score[1 - side]
+        source, target = ends[side]
+
+        current, _ = open_set.pop()
+        result.visited += 1
+
+        opened = []
+        temp_g_score = mine[current] + 1
+        neighbors = grid.neighbors(current)
+        result.neighbor_checks += len(neighbors)
+        for neighbor in neighbors:
+            if temp_g_score < mine.get(neighbor, float("inf")):
+                mine[neighbor] = temp_g_score
+                parents[side][neighbor] = current
+                if neighbor not in open_set:
+                    opened.append(neighbor)
+                open_set.push(neighbor, temp_g_score + balanced(neighbor, source, target))
+                if neighbor in theirs and temp_g_score + theirs[neighbor] < best:
+                    best = temp_g_score + theirs[neighbor]
+                    meet = neighbor
+
+        yield current, opened
+
+    if meet is not None:
+        result.found = True
+        result.path = _join(parents, meet)
+    result.count_queue(*open_sets)
+    return result
@@ -0,0 +1,202 @@
+from collections import OrderedDict
+
+from .grid import BARRIER
+from .heaps import BucketQueue
+from .algorithms import SearchResult
+from .registry import search
+
+# --- PATH CACHE ---
+# Answers repeated queries without searching. Results are kept per
+# (algorithm, start, end) in an LRU of bounded size, valid for the map
+# revision (grid.version, grid.cost_version) they were found on.
+#
+# A start that keeps missing with different ends gets a shortest-path tree
+# instead: one Dijkstra that floods its whole component, after which every
+# end is a walk up the parent pointers. Trees only answer algorithms that
+# return optimal paths (for steps on unweighted maps, for cost otherwise),
+# and are kept in a smaller LRU of their own.
+#
+# Edits are handled like LPA*/HPA*/ComponentIndex do, through
+# update_cell(i), which drops only what the edit can change:
+#   barrier added        entries whose path runs through i, trees that
+#                        reached i
+#   opened / cost change entries through i, entries without a path, and
+#                        entries that a detour through i could beat (its
+#                        Manhattan bound is below the cached cost); trees
+#                        that reached i or one of its neighbors
+# Edits that were not reported are caught by the revision: the first
+# lookup after one clears everything.
+
+CAPACITY = 256
+TREES = 8
+TREE_AFTER = 2  # ends missed from one start before it gets a tree
+COST_OPTIMAL = {"A*", "Dijkstra", "LPA*", "Dial", "Dial-A*", "ALT"}
+STEP_OPTIMAL = COST_OPTIMAL | {"BFS", "JPS", "Bi-BFS", "Bi-A*", "Wavefront"}
+
+
+def shortest_path_tree(grid, start, targets=None):
+    # Dijkstra from start over everything it can reach: cell -> parent
+    # (start -> None) and cell -> path cost. With targets (cells reachable
+    # from start), it stops as soon as all of them are settled.
+    parent = {start: None}
+    dist = {start: 0}
+    if grid.cells[start] == BARRIER:
+        return parent, dist
+    remaining = None if targets is None else set(targets) - {start}
+    if remaining is not None and not remaining:
+        return parent, dist
+    costs, neighbors = grid.costs, grid.neighbors
+    queue = BucketQueue()
+    queue.push(start, 0)
+    while queue:
+        current, d = queue.pop()
+        if remaining is not None:
+            remaining.discard(current)
+            if not remaining:
+                break
+        for n in neighbors(current):
+            nd = d + costs[n]
+            if nd < dist.get(n, nd + 1):
+                dist[n] = nd
+                parent[n] = current
+                queue.push(n, nd)
+    return parent, dist
+
+
+def tree_path(parent, end):
+    # Path from the tree's start to end, [] if the tree didn't reach it
+    path = []
+    if end in parent:
+        while end is not None:
+            path.append(end)
+            end = parent[end]
+        path.reverse()
+    return path
+
+
+class PathCache:
+    def __init__(self, grid, capacity=CAPACITY, trees=TREES):
+        self.grid = grid
+        self.capacity = capacity
+        self.max_trees = trees
+        self.entries = OrderedDict()  # (name, start, end) -> (found, path, cost)
+        self.trees = OrderedDict()    # start -> (parent, dist)
+        self.missed = OrderedDict()   # start -> ends it missed with
+        self.revision = self._revision()
+        self.hits = 0
+        self.misses = 0
+
+    def _revision(self):
+        return self.grid.version, self.grid.cost_version
+
+    def clear(self):
+        self.entries.clear()
+        self.trees.clear()
+        self.missed.clear()
+        self.revision = self._revision()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, name, start, end):
+        # Cached result for the query, or None. Counts a hit or a miss; a
+        # miss with the TREE_AFTER-th different end from one start builds its
+        # tree and answers from it (not another algorithm on the same query,
+        # which the visualizer runs to compare them).
+        if self.revision != self._revision():
+            self.clear()
+        key = (name, start, end)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self._result(entry[0], entry[1])
+        tree = None
+        optimal = name in (COST_OPTIMAL if self.grid.is_weighted() else STEP_OPTIMAL)
+        if optimal:
+            tree = self.trees.get(start)
+            if tree is not None:
+                self.trees.move_to_end(start)
+                self.hits += 1
+            elif len(self.missed.get(start, set()) | {end}) >= TREE_AFTER:
+                tree = self._grow(start)
+        if tree is None:
+            self.misses += 1
+            if optimal:
+                self.missed[start] = self.missed.pop(start, set()) | {end}
+                if len(self.missed) > self.capacity:
+                    self.missed.popitem(last=False)
+            return None
+        parent, dist = tree
+        path = tree_path(parent, end)
+        if path:
+            self._store(key, True, path, dist[end])
+        else:
+            self._store(key, False, [], 0)
+        return self._result(bool(path), path)
+
+    def put(self, name, start, end, result):
+        # Remember a result found on the current revision
+        if self.revision != self._revision():
+            self.clear()
+        cost = self.grid.path_cost(result.path) if result.found else 0
+        self._store((name, start, end), result.found, result.path, cost)
+
+    def search(self, name, start, end, components=None):
+        # registry.search() behind the cache
+        result = self.get(name, start, end)
+        if result is None:
+            result = search(name, self.grid, start, end, components)
+            self.put(name, start, end, result)
+        return result
+
+    def update_cell(self, i):
+        # Call after a barrier was set or cleared, or the terrain cost
+        # changed, at cell i
+        grid = self.grid
+        if grid.cells[i] == BARRIER:
+            stale = [key for key, (found, path, cost) in self.entries.items() if i in path]
+            touched = (i,)
+        else:
+            cols = grid.cols
+            ir, ic = divmod(i, cols)
+            stale = []
+            for key, (found, path, cost) in self.entries.items():
+                if not found or i in path:
+                    stale.append(key)
+                    continue
+                _, start, end = key
+                sr, sc = divmod(start, cols)
+                er, ec = divmod(end, cols)
+                if abs(sr - ir) + abs(sc - ic) + abs(ir - er) + abs(ic - ec) < cost:
+                    stale.append(key)
+            touched = [i] + grid.adjacent(i)
+        for key in stale:
+            del self.entries[key]
+        for start in [s for s, (parent, _) in self.trees.items() if any(c in parent for c in touched)]:
+            del self.trees[start]
+        # Everything left is still valid on the new revision
+        self.revision = self._revision()
+
+    def _grow(self, start):
+        tree = self.trees[start] = shortest_path_tree(self.grid, start)
+        if len(self.trees) > self.max_trees:
+            self.trees.popitem(last=False)
+        self.missed.pop(start, None)
+        self.misses += 1
+        return tree
+
+    def _store(self, key, found, path, cost):
+        self.entries[key] = (found, path, cost)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    @staticmethod
+    def _result(found, path):
+        # A fresh result per hit: nothing was searched, so no counters
+        result = SearchResult()
+        result.found = found
+        result.path = list(path)
+        result.cached = True
+        return result
@@ -0,0 +1,181 @@
+from collections import deque
+
+import numpy as np
+
+from .grid import BARRIER, DOWN, RIGHT
+
+# --- CONNECTED COMPONENTS ---
+# A label per cell (-1 for barriers), equal for cells that can reach each
+# other, so "is there a path at all" is one comparison instead of a search
+# that floods everything reachable from start. Needs numpy (imported on
+# demand: `from pathfinding.components import ComponentIndex`).
+#
+# The labels are built in one vectorized pass over the grid's adjacency:
+# every cell starts as its own root, each round hooks the larger root of
+# every open edge onto the smaller one and then jumps pointers until every
+# cell points at its root. This takes a handful of rounds even on mazes.
+#
+# After that the index follows barrier edits like LPA*/HPA* do, through
+# update_cell(i):
+#   barrier removed  components of the new cell's neighbors are merged,
+#                    the smaller ones relabeled (union by size)
+#   barrier added    its component may fall apart. The open neighbors are
+#                    flooded in lockstep until the floods meet; only a part
+#                    that got cut off is fully flooded (it is the smaller
+#                    one) and gets a new label
+# So an edit costs time in the smaller of the parts involved, not the map.
+# version is the grid.version the labels are for; barrier edits that were
+# not reported leave it behind, and the owner rebuilds (like landmarks_for).
+
+
+class ComponentIndex:
+    def __init__(self, grid):
+        self.grid = grid
+        self.rebuild()
+
+    def rebuild(self):
+        # Label every cell from scratch, after bulk edits
+        grid = self.grid
+        self.version = grid.version
+        adjacency = np.frombuffer(grid.adjacency, dtype=np.uint8)
+        passable = np.frombuffer(grid.cells, dtype=np.uint8) != BARRIER
+        cells = np.flatnonzero(passable)
+        right = cells[(adjacency[cells] & RIGHT) != 0]
+        down = cells[(adjacency[cells] & DOWN) != 0]
+        u = np.concatenate([right, down])
+        v = np.concatenate([right + 1, down + grid.cols])
+
+        parent = np.arange(grid.size)
+        while True:
+            pu, pv = parent[u], parent[v]
+            differ = pu != pv
+            if not differ.any():
+                break
+            # Edges inside one component stay that way, drop them
+            u, v, pu, pv = u[differ], v[differ], pu[differ], pv[differ]
+            # Both ends are roots here: hook the larger onto the smaller
+            np.minimum.at(parent, np.maximum(pu, pv), np.minimum(pu, pv))
+            while True:
+                jumped = parent[parent]
+                if (jumped == parent).all():
+                    break
+                parent = jumped
+
+        parent[~passable] = -1
+        self.labels = parent.tolist()
+        roots, counts = np.unique(parent[passable], return_counts=True)
+        self.sizes = dict(zip(roots.tolist(), counts.tolist()))
+        self.next_label = grid.size  # fresh labels never clash with roots
+
+    def connected(self, a, b):
+        labels = self.labels
+        return labels[a] != -1 and labels[a] == labels[b]
+
+    def component(self, i):
+        # Label of i's component, -1 for a barrier
+        return self.labels[i]
+
+    def __len__(self):
+        # Number of components
+        return len(self.sizes)
+
+    def update_cell(self, i):
+        # Call after a barrier was set or cleared at cell i
+        passable = self.grid.cells[i] != BARRIER
+        if passable and self.labels[i] == -1:
+            self._open(i)
+        elif not passable and self.labels[i] != -1:
+            self._close(i)
+        self.version = self.grid.version
+
+    def _new_label(self):
+        self.next_label += 1
+        return self.next_label
+
+    def _relabel(self, seed, old, new):
+        # Flood old's cells from seed, labeling them new
+        labels, neighbors = self.labels, self.grid.neighbors
+        labels[seed] = new
+        q = deque([seed])
+        while q:
+            for n in neighbors(q.popleft()):
+                if labels[n] == old:
+                    labels[n] = new
+                    q.append(n)
+
+    def _open(self, i):
+        labels, sizes = self.labels, self.sizes
+        seeds = {}
+        for n in self.grid.neighbors(i):
+            seeds.setdefault(labels[n], n)
+        if not seeds:
+            label = self._new_label()
+            sizes[label] = 0
+        else:
+            # Keep the biggest label, move the others over to it
+            label = max(seeds, key=sizes.get)
+            for old, seed in seeds.items():
+                if old != label:
+                    self._relabel(seed, old, label)
+                    sizes[label] += sizes.pop(old)
+        labels[i] = label
+        sizes[label] += 1
+
+    def _close(self, i):
+        labels, sizes, neighbors = self.labels, self.sizes, self.grid.neighbors
+        old = labels[i]
+        labels[i] = -1
+        sizes[old] -= 1
+        starts = [n for n in self.grid.adjacent(i) if labels[n] == old]
+        if not starts:
+            del sizes[old]
+            return
+        if len(starts) == 1:
+            return
+
+        # One flood per open neighbor, expanded one cell at a time in turn.
+        # owner: cell -> flood that reached it first; group: flood -> the
+        # flood it merged into (a tiny union-find over at most 4 floods).
+        owner = {n: k for k, n in enumerate(starts)}
+        group = list(range(len(starts)))
+        queues = [deque([n]) for n in starts]
+
+        def find(k):
+            while group[k] != k:
+                k = group[k]
+            return k
+
+        live = set(range(len(starts)))  # groups still being flooded
+        while len(live) > 1:
+            for k in list(live):
+                if k not in live:
+                    continue
+                q = queues[k]
+                if not q:
+                    # Flood k ran out without meeting the others: cut off
+                    live.discard(k)
+                    label = self._new_label()
+                    members = [c for c, o in owner.items() if find(o) == k]
+                    for c in members:
+                        labels[c] = label
+                    sizes[label] = len(members)
+                    sizes[old] -= len(members)
+                    if len(live) == 1:
+                        break
+                    continue
+                for n in neighbors(q.popleft()):
+                    if labels[n] != old:
+                        continue
+                    o = owner.get(n)
+                    if o is None:
+                        owner[n] = k
+                        q.append(n)
+                    elif find(o) != k:
+                        # Met another flood: same component, merge them
+                        other = find(o)
+                        group[other] = k
+                        q.extend(queues[other])
+                        queues[other] = deque()
+                        live.discard(other)
+                        if len(live) == 1:
+                            break
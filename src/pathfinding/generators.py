@@ -0,0 +1,162 @@
+import numpy as np
+
+from .grid import Grid, BARRIER, MIN_COST, MAX_COST
+from .maps import maze_pattern, spiral_pattern
+
+# --- MAP GENERATORS ---
+# Barrier masks for benchmark maps of any size, built with NumPy as a
+# (rows, cols) bool array (True = barrier) instead of one set_barrier()
+# call per cell. Every generator takes a numpy Generator, so a map is fully
+# determined by its family, size and seed. Needs numpy (imported on
+# demand: `from pathfinding.generators import generate_grid`).
+#
+#   empty        no barriers
+#   random       every cell a barrier with probability density
+#   backtracker  perfect maze from a randomized depth-first search: one path
+#                between any two cells, long dead ends
+#   rooms        rectangular rooms of random size, one door in every wall
+#                between two neighboring rooms
+#   maze         the visualizer's Maze pattern (maps.generate_map_1) scaled
+#                up: one-cell corridors over 80% of the width
+#   spiral       the Spiral pattern (maps.generate_map_2) scaled up
+#
+# The backtracker is the one generator that walks cell by cell (a DFS has
+# to), on the half-resolution lattice of maze cells; about 1.5 s at
+# 2000x2000. The others are a few array operations at any size.
+
+DENSITY = 0.2
+ROOM_MIN, ROOM_MAX = 6, 16  # room pitch (room plus one wall) in cells
+
+
+def empty(rows, cols, rng=None):
+    return np.zeros((rows, cols), dtype=bool)
+
+
+def random_barriers(rows, cols, rng, density=DENSITY):
+    return rng.random((rows, cols)) < density
+
+
+def backtracker(rows, cols, rng):
+    # Maze cells sit at even (row, col), the cells between them are walls
+    # until the DFS carves a passage through
+    h, w = (rows + 1) // 2, (cols + 1) // 2
+    n = h * w
+    visited = bytearray(n)
+    # One draw per carved passage; 12 is divisible by every possible number
+    # of choices (1-4), so draw % choices is uniform
+    draws = rng.integers(0, 12, size=max(n - 1, 0)).tolist()
+    src, dst = [], []
+    k = 0
+    first = int(rng.integers(n))
+    visited[first] = 1
+    stack = [first]
+    while stack:
+        cell = stack[-1]
+        r, c = divmod(cell, w)
+        options = []
+        if r > 0 and not visited[cell - w]:
+            options.append(cell - w)
+        if r < h - 1 and not visited[cell + w]:
+            options.append(cell + w)
+        if c > 0 and not visited[cell - 1]:
+            options.append(cell - 1)
+        if c < w - 1 and not visited[cell + 1]:
+            options.append(cell + 1)
+        if not options:
+            stack.pop()
+            continue
+        nxt = options[draws[k] % len(options)]
+        k += 1
+        visited[nxt] = 1
+        src.append(cell)
+        dst.append(nxt)
+        stack.append(nxt)
+
+    mask = np.ones((2 * h - 1, 2 * w - 1), dtype=bool)
+    mask[::2, ::2] = False
+    sr, sc = np.divmod(np.array(src, dtype=np.intp), w)
+    dr, dc = np.divmod(np.array(dst, dtype=np.intp), w)
+    mask[sr + dr, sc + dc] = False  # the wall between two lattice cells
+    # Even sizes have one row/column more than the lattice covers: repeat
+    # the last one, so the border corridors are two cells wide there
+    if rows % 2 == 0:
+        mask = np.vstack([mask, mask[-1:]])
+    if cols % 2 == 0:
+        mask = np.hstack([mask, mask[:, -1:]])
+    return mask
+
+
+def _walls(size, rng):
+    # Positions of wall lines at random pitches; never the last line, so
+    # both corners of the map stay inside rooms
+    pitches = rng.integers(ROOM_MIN, ROOM_MAX + 1, size=size // ROOM_MIN + 1)
+    walls = np.cumsum(pitches) - 1
+    return walls[walls < size - 1]
+
+
+def _doors(walls, size, rng):
+    # One random position per span between two crossing walls
+    starts = np.concatenate([[0], walls + 1])
+    ends = np.concatenate([walls, [size]])
+    return starts + rng.integers(0, ends - starts)
+
+
+def rooms(rows, cols, rng):
+    wall_rows, wall_cols = _walls(rows, rng), _walls(cols, rng)
+    mask = np.zeros((rows, cols), dtype=bool)
+    mask[wall_rows, :] = True
+    mask[:, wall_cols] = True
+    # A door per room side: for every wall row one per column span, and
+    # the other way round
+    if wall_rows.size:
+        doors = np.array([_doors(wall_cols, cols, rng) for _ in wall_rows])
+        mask[wall_rows[:, None], doors] = False
+    if wall_cols.size:
+        doors = np.array([_doors(wall_rows, rows, rng) for _ in wall_cols])
+        mask[doors, wall_cols[:, None]] = False
+    return mask
+
+
+def _pattern(draw, rows, cols):
+    # Mask of one of the pure-Python patterns in maps.py, drawn once
+    cells = bytearray(rows * cols)
+    draw(cells, rows, cols)
+    return np.frombuffer(cells, dtype=np.uint8).reshape(rows, cols) == BARRIER
+
+
+def maze(rows, cols, rng=None):
+    return _pattern(maze_pattern, rows, cols)
+
+
+def spiral(rows, cols, rng=None):
+    return _pattern(spiral_pattern, rows, cols)
+
+
+FAMILIES = {
+    "empty": empty,
+    "random": random_barriers,
+    "backtracker": backtracker,
+    "rooms": rooms,
+    "maze": maze,
+    "spiral": spiral,
+}
+
+
+def barrier_mask(family, rows, cols=None, seed=None):
+    cols = rows if cols is None else cols
+    return FAMILIES[family](rows, cols, np.random.default_rng(seed))
+
+
+def grid_from_mask(mask):
+    rows, cols = mask.shape
+    return Grid(rows, cols, bytearray((mask * BARRIER).astype(np.uint8).tobytes()))
+
+
+def generate_grid(family, rows, cols=None, seed=None):
+    return grid_from_mask(barrier_mask(family, rows, cols, seed))
+
+
+def random_costs(grid, rng):
+    # Random terrain, every cell costs MIN_COST..MAX_COST to enter
+    grid.costs[:] = rng.integers(MIN_COST, MAX_COST + 1, size=grid.size, dtype=np.uint8).tobytes()
+    grid.cost_version += 1
@@ -0,0 +1,149 @@
+# --- GRID ---
+# Cells live in one flat bytearray (1 byte per cell), addressed by
+# index = row * cols + col. Only BARRIER matters to the search; the other
+# states are what the visualizer paints.
+#
+# Next to it, adjacency holds a 4-bit mask per cell with one bit for each
+# open neighbor. It is kept up to date by set_state() (which every barrier
+# change goes through) for the toggled cell and its four neighbors only,
+# so a search never has to sweep the grid before its first expansion.
+#
+# version counts barrier changes, so data derived from the map (landmark
+# distances, ...) can tell when it went stale; cost_version does the same
+# for terrain costs.
+#
+# costs holds the terrain cost of entering each cell (1 byte, MIN_COST to
+# MAX_COST, 1 everywhere on an unweighted map). A*, Dijkstra and LPA*
+# charge it per step; the other algorithms only count steps.
+
+EMPTY = 0
+BARRIER = 1
+START = 2
+END = 3
+OPEN = 4
+CLOSED = 5
+PATH = 6
+
+MIN_COST = 1
+MAX_COST = 9
+
+# Adjacency bits, in the order neighbors are visited
+DOWN = 1
+UP = 2
+RIGHT = 4
+LEFT = 8
+
+# Byte translation tables: OPEN/CLOSED/PATH -> EMPTY, other states unchanged
+_CLEAR_MARKS = bytes(EMPTY if state in (OPEN, CLOSED, PATH) else state for state in range(256))
+# state -> 1 if passable, 0 if barrier
+_PASSABLE = bytes(0 if state == BARRIER else 1 for state in range(256))
+
+
+class Grid:
+    def __init__(self, rows, cols=None, cells=None, costs=None):
+        # cells, costs: optional bytearrays of rows * cols values to take over
+        self.rows = rows
+        self.cols = rows if cols is None else cols
+        self.size = self.rows * self.cols
+        self.cells = bytearray(self.size) if cells is None else cells
+        self.costs = bytearray([MIN_COST]) * self.size if costs is None else costs
+        self.version = 0
+        self.cost_version = 0
+        self.adjacency = bytearray(self.size)
+        # Neighbor offsets for each of the 16 masks, DOWN, UP, RIGHT, LEFT order
+        steps = ((DOWN, self.cols), (UP, -self.cols), (RIGHT, 1), (LEFT, -1))
+        self.offsets = [tuple(d for bit, d in steps if mask & bit) for mask in range(16)]
+        self.rebuild_adjacency()
+
+    def rebuild_adjacency(self):
+        # Full rebuild, only needed after writing cells in bulk. Works on the
+        # whole grid as one big integer with one byte per cell (0 or 1), so
+        # shifting by 8 bits moves to the next cell and by 8 * cols bits to
+        # the next row; everything runs in C.
+        size, cols = self.size, self.cols
+        self.version += 1
+        if not size:
+            return
+        passable = int.from_bytes(self.cells.translate(_PASSABLE), "little")
+        ones = int.from_bytes(b"\x01" * size, "little")
+        not_last_col = int.from_bytes((b"\x01" * (cols - 1) + b"\x00") * self.rows, "little")
+        not_first_col = int.from_bytes((b"\x00" + b"\x01" * (cols - 1)) * self.rows, "little")
+        down = passable >> (8 * cols)
+        up = (passable << (8 * cols)) & ones
+        right = (passable >> 8) & not_last_col
+        left = (passable << 8) & not_first_col
+        mask = (down * DOWN + up * UP + right * RIGHT + left * LEFT) & (passable * 15)
+        self.adjacency[:] = mask.to_bytes(size, "little")
+
+    def index(self, row, col):
+        return row * self.cols + col
+
+    def pos(self, i):
+        return divmod(i, self.cols)
+
+    def is_barrier(self, i):
+        return self.cells[i] == BARRIER
+
+    def set_state(self, i, state):
+        # All writes that can turn a barrier on or off go through here
+        was_barrier = self.cells[i] == BARRIER
+        self.cells[i] = state
+        if was_barrier != (state == BARRIER):
+            self.version += 1
+            self._update_adjacency(i)
+
+    def set_barrier(self, i):
+        self.set_state(i, BARRIER)
+
+    def clear(self, i):
+        self.set_state(i, EMPTY)
+
+    def _update_adjacency(self, i):
+        # Recompute the masks of cell i and its four neighbors
+        cells, adjacency, cols, size = self.cells, self.adjacency, self.cols, self.size
+        c = i % cols
+        for j in (i, i + cols, i - cols, i + 1 if c < cols - 1 else -1, i - 1 if c > 0 else -1):
+            if not 0 <= j < size:
+                continue
+            mask = 0
+            if cells[j] != BARRIER:
+                jc = j % cols
+                if j + cols < size and cells[j + cols] != BARRIER:
+                    mask |= DOWN
+                if j >= cols and cells[j - cols] != BARRIER:
+                    mask |= UP
+                if jc < cols - 1 and cells[j + 1] != BARRIER:
+                    mask |= RIGHT
+                if jc > 0 and cells[j - 1] != BARRIER:
+                    mask |= LEFT
+            adjacency[j] = mask
+
+    def set_cost(self, i, cost):
+        cost = max(MIN_COST, min(MAX_COST, cost))
+        if self.costs[i] != cost:
+            self.costs[i] = cost
+            self.cost_version += 1
+
+    def is_weighted(self):
+        return self.costs.count(MIN_COST) != self.size
+
+    def path_cost(self, path):
+        # Terrain cost of walking path (the start cell is free)
+        costs = self.costs
+        return sum(costs[i] for i in path[1:])
+
+    def clear_marks(self):
+        # Drop what a previous search painted, in one pass in C
+        self.cells[:] = self.cells.translate(_CLEAR_MARKS)
+
+    def neighbors(self, i):
+        # Open neighbors, same order as the old Node.update_neighbors:
+        # DOWN, UP, RIGHT, LEFT
+        return [i + d for d in self.offsets[self.adjacency[i]]]
+
+    def adjacent(self, i):
+        # All in-bounds neighbors, barriers included
+        cols = self.cols
+        c = i % cols
+        return [j for j, ok in ((i + cols, i + cols < self.size), (i - cols, i >= cols),
+                                (i + 1, c < cols - 1), (i - 1, c > 0)) if ok]
@@ -0,0 +1,316 @@
+import heapq
+from collections import deque
+
+# --- PRIORITY QUEUES ---
+# Single-threaded replacements for queue.PriorityQueue. All of them share
+# one small interface so the search algorithms can take any of them:
+#   push(item, priority)  insert, or lower the priority of a queued item
+#   pop() -> (item, priority)
+#   top() -> (item, priority) without removing it
+#   len(queue), item in queue
+# and count pushes, pops, decrease-keys and stale pops. Ties pop in FIFO order.
+
+
+class IndexedHeap:
+    # Binary heap with a position index per item, so decrease-key is a
+    # sift-up in place instead of a duplicate entry.
+    def __init__(self):
+        self.heap = []      # (priority, count, item)
+        self.pos = {}       # item -> index in heap
+        self.count = 0
+        self.pushes = 0
+        self.pops = 0
+        self.decrease_keys = 0
+        self.stale_pops = 0  # always 0, entries are updated in place
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, item):
+        return item in self.pos
+
+    def push(self, item, priority):
+        i = self.pos.get(item)
+        if i is None:
+            self.pushes += 1
+            i = len(self.heap)
+            self.heap.append(None)
+        else:
+            if priority >= self.heap[i][0]:
+                return
+            self.decrease_keys += 1
+        self.count += 1
+        self._sift_up(i, (priority, self.count, item))
+
+    def pop(self):
+        heap = self.heap
+        self.pops += 1
+        top = heap[0]
+        last = heap.pop()
+        del self.pos[top[2]]
+        if heap:
+            self._sift_down(0, last)
+        return top[2], top[0]
+
+    def top(self):
+        entry = self.heap[0]
+        return entry[2], entry[0]
+
+    # Only IndexedHeap supports these two (LPA* needs them):
+
+    def update(self, item, priority):
+        # Like push(), but may also raise the priority of a queued item
+        i = self.pos.get(item)
+        if i is None or priority < self.heap[i][0]:
+            self.push(item, priority)
+        elif priority > self.heap[i][0]:
+            self.count += 1
+            self._sift_down(i, (priority, self.count, item))
+
+    def remove(self, item):
+        i = self.pos.pop(item)
+        removed = self.heap[i]
+        last = self.heap.pop()
+        if i < len(self.heap):
+            if last < removed:
+                self._sift_up(i, last)
+            else:
+                self._sift_down(i, last)
+
+    def _sift_up(self, i, entry):
+        heap = self.heap
+        pos = self.pos
+        while i > 0:
+            parent = (i - 1) >> 1
+            p = heap[parent]
+            if p < entry:
+                break
+            heap[i] = p
+            pos[p[2]] = i
+            i = parent
+        heap[i] = entry
+        pos[entry[2]] = i
+
+    def _sift_down(self, i, entry):
+        heap = self.heap
+        pos = self.pos
+        n = len(heap)
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            right = child + 1
+            if right < n and heap[right] < heap[child]:
+                child = right
+            c = heap[child]
+            if entry < c:
+                break
+            heap[i] = c
+            pos[c[2]] = i
+            i = child
+        heap[i] = entry
+        pos[entry[2]] = i
+
+
+class PairingHeap:
+    # Pairing heap: O(1) push and decrease-key, amortized O(log n) pop.
+    # Nodes are lists [priority, count, item, child, sibling, prev].
+    def __init__(self):
+        self.root = None
+        self.nodes = {}     # item -> node
+        self.count = 0
+        self.pushes = 0
+        self.pops = 0
+        self.decrease_keys = 0
+        self.stale_pops = 0  # always 0, entries are updated in place
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, item):
+        return item in self.nodes
+
+    def push(self, item, priority):
+        self.count += 1
+        node = self.nodes.get(item)
+        if node is None:
+            self.pushes += 1
+            node = [priority, self.count, item, None, None, None]
+            self.nodes[item] = node
+            self.root = node if self.root is None else self._meld(self.root, node)
+            return
+        if priority >= node[0]:
+            return
+        self.decrease_keys += 1
+        node[0] = priority
+        node[1] = self.count
+        if node is self.root:
+            return
+        # Cut the subtree out of its parent's child list and meld it back
+        prev, sibling = node[5], node[4]
+        if prev[3] is node:
+            prev[3] = sibling
+        else:
+            prev[4] = sibling
+        if sibling is not None:
+            sibling[5] = prev
+        node[4] = node[5] = None
+        self.root = self._meld(self.root, node)
+
+    def pop(self):
+        self.pops += 1
+        top = self.root
+        del self.nodes[top[2]]
+        # Two-pass pairing of the root's children
+        pairs = []
+        child = top[3]
+        while child is not None:
+            second = child[4]
+            if second is None:
+                child[5] = None
+                pairs.append(child)
+                break
+            rest = second[4]
+            child[4] = child[5] = second[4] = second[5] = None
+            pairs.append(self._meld(child, second))
+            child = rest
+        root = None
+        for node in reversed(pairs):
+            root = node if root is None else self._meld(node, root)
+        self.root = root
+        return top[2], top[0]
+
+    def top(self):
+        return self.root[2], self.root[0]
+
+    @staticmethod
+    def _meld(a, b):
+        if b[0] < a[0] or (b[0] == a[0] and b[1] < a[1]):
+            a, b = b, a
+        # b becomes the first child of a
+        first = a[3]
+        b[4] = first
+        b[5] = a
+        if first is not None:
+            first[5] = b
+        a[3] = b
+        a[4] = a[5] = None
+        return a
+
+
+class LazyHeap:
+    # heapq with lazy deletion: a decrease-key pushes a new entry and the
+    # outdated one is skipped when it reaches the top (counted as a stale pop).
+    def __init__(self):
+        self.heap = []
+        self.best = {}      # item -> current priority of queued items
+        self.count = 0
+        self.pushes = 0
+        self.pops = 0
+        self.decrease_keys = 0
+        self.stale_pops = 0
+
+    def __len__(self):
+        return len(self.best)
+
+    def __contains__(self, item):
+        return item in self.best
+
+    def push(self, item, priority):
+        old = self.best.get(item)
+        if old is not None:
+            if priority >= old:
+                return
+            self.decrease_keys += 1
+        self.pushes += 1
+        self.count += 1
+        self.best[item] = priority
+        heapq.heappush(self.heap, (priority, self.count, item))
+
+    def pop(self):
+        item, priority = self.top()
+        heapq.heappop(self.heap)
+        del self.best[item]
+        self.pops += 1
+        return item, priority
+
+    def top(self):
+        # Drop stale entries sitting on top first
+        heap = self.heap
+        best = self.best
+        while True:
+            priority, _, item = heap[0]
+            if best.get(item) == priority:
+                return item, priority
+            heapq.heappop(heap)
+            self.stale_pops += 1
+
+
+class BucketQueue:
+    # Dial's bucket queue for small non-negative integer priorities that
+    # never go below the last popped one (Dijkstra, A* with a consistent
+    # heuristic). One FIFO bucket per priority and a cursor that only moves
+    # up, so push and pop are O(1) and a whole search is O(n + max priority)
+    # instead of paying O(log n) per operation. Decrease-key is lazy like
+    # LazyHeap: the old entry stays in its bucket and is skipped later.
+    def __init__(self):
+        self.buckets = []   # priority -> deque of items
+        self.best = {}      # item -> current priority of queued items
+        self.cursor = 0     # no live entry below this priority
+        self.pushes = 0
+        self.pops = 0
+        self.decrease_keys = 0
+        self.stale_pops = 0
+
+    def __len__(self):
+        return len(self.best)
+
+    def __contains__(self, item):
+        return item in self.best
+
+    def push(self, item, priority):
+        old = self.best.get(item)
+        if old is not None:
+            if priority >= old:
+                return
+            self.decrease_keys += 1
+        self.pushes += 1
+        self.best[item] = priority
+        buckets = self.buckets
+        while len(buckets) <= priority:
+            buckets.append(deque())
+        buckets[priority].append(item)
+        if priority < self.cursor:
+            self.cursor = priority
+
+    def pop(self):
+        item, priority = self.top()
+        self.buckets[priority].popleft()
+        del self.best[item]
+        self.pops += 1
+        return item, priority
+
+    def top(self):
+        # Move the cursor to the first bucket with a live entry, dropping
+        # stale entries on the way
+        buckets = self.buckets
+        best = self.best
+        cursor = self.cursor
+        while True:
+            bucket = buckets[cursor]
+            while bucket:
+                item = bucket[0]
+                if best.get(item) == cursor:
+                    self.cursor = cursor
+                    return item, cursor
+                bucket.popleft()
+                self.stale_pops += 1
+            cursor += 1
+
+
+QUEUES = {
+    "indexed": IndexedHeap,
+    "pairing": PairingHeap,
+    "lazy": LazyHeap,
+    "bucket": BucketQueue,
+}
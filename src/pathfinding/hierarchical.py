@@ -0,0 +1,263 @@
+import time
+import weakref
+from collections import deque
+
+from .heaps import IndexedHeap
+from .algorithms import SearchResult, h
+
+# --- HIERARCHICAL SEARCH (HPA*) ---
+# The grid is cut into square clusters. Where two neighboring clusters share
+# an open stretch of border, one or two transitions (a cell pair across the
+# border) become nodes of an abstract graph; nodes of the same cluster are
+# joined by their exact in-cluster distance. A query links start and end to
+# the nodes of their own clusters, runs A* on the abstract graph and then
+# refines only the abstract edges on the result into cell paths.
+#
+# The abstract graph is built lazily, a cluster the first time a search
+# reaches it, and cached between queries; build() does all clusters up
+# front. update_cell() drops the cached parts of the edited cluster and its
+# four neighbors only. hpa_for(grid) keeps one HPAStar per grid, so
+# queries through the registry share the graph too.
+#
+# visited counts abstract nodes; the cells the in-cluster BFS expands are
+# counted apart, in cluster_visited.
+#
+# The path is not always optimal: crossings are restricted to the chosen
+# transitions. optimality_gap() measures it against a plain A* path.
+
+CLUSTER = 16
+# Open border stretches at least this long get a transition at each end
+# instead of one in the middle
+WIDE_ENTRANCE = 6
+
+
+class HPAStar:
+    def __init__(self, grid, cluster=CLUSTER):
+        self.grid = grid
+        self.cluster = cluster
+        self.borders = {}  # (cluster, "R" or "D") -> [(cell, cell across)]
+        self.edges = {}    # cluster -> {node: [(neighbor, cost)]}
+        self.expanded = 0  # cells expanded by in-cluster searches
+        self.version = grid.version  # barriers the cached graph is for
+        self.build_time = 0
+
+    def cluster_of(self, i):
+        r, c = divmod(i, self.grid.cols)
+        return (r // self.cluster, c // self.cluster)
+
+    def bounds(self, cluster):
+        cr, cc = cluster
+        size = self.cluster
+        return (cr * size, min((cr + 1) * size, self.grid.rows),
+                cc * size, min((cc + 1) * size, self.grid.cols))
+
+    def border(self, cluster, side):
+        # Transitions from cluster to its right ("R") or lower ("D") neighbor
+        key = (cluster, side)
+        if key in self.borders:
+            return self.borders[key]
+        grid = self.grid
+        r0, r1, c0, c1 = self.bounds(cluster)
+        if side == "R":
+            pairs = [(grid.index(r, c1 - 1), grid.index(r, c1)) for r in range(r0, r1)] if c1 < grid.cols else []
+        else:
+            pairs = [(grid.index(r1 - 1, c), grid.index(r1, c)) for c in range(c0, c1)] if r1 < grid.rows else []
+
+        transitions = []
+        run = []
+        for a, b in pairs + [(None, None)]:
+            if a is not None and not grid.is_barrier(a) and not grid.is_barrier(b):
+                run.append((a, b))
+                continue
+            if len(run) >= WIDE_ENTRANCE:
+                transitions += [run[0], run[-1]]
+            elif run:
+                transitions.append(run[len(run) // 2])
+            run = []
+        self.borders[key] = transitions
+        return transitions
+
+    def nodes(self, cluster):
+        # Abstract nodes inside cluster with their neighbors across the border
+        cr, cc = cluster
+        across = {}
+        for a, b in self.border(cluster, "R") + self.border(cluster, "D"):
+            across.setdefault(a, []).append(b)
+        if cc > 0:
+            for a, b in self.border((cr, cc - 1), "R"):
+                across.setdefault(b, []).append(a)
+        if cr > 0:
+            for a, b in self.border((cr - 1, cc), "D"):
+                across.setdefault(b, []).append(a)
+        return across
+
+    def graph(self, cluster):
+        # Cached adjacency of the abstract nodes in cluster
+        edges = self.edges.get(cluster)
+        if edges is None:
+            across = self.nodes(cluster)
+            edges = {}
+            for node, others in across.items():
+                dist = self.distances(node, cluster, across)
+                edges[node] = [(other, 1) for other in others] + \
+                              [(n, d) for n, d in dist.items() if n != node]
+            self.edges[cluster] = edges
+        return edges
+
+    def distances(self, source, cluster, targets):
+        # BFS inside the cluster from source, distances to the target cells
+        grid = self.grid
+        offsets, adjacency, cols = grid.offsets, grid.adjacency, grid.cols
+        r0, r1, c0, c1 = self.bounds(cluster)
+        dist = {source: 0}
+        found = {}
+        q = deque([source])
+        while q and len(found) < len(targets):
+            current = q.popleft()
+            self.expanded += 1
+            if current in targets:
+                found[current] = dist[current]
+            for d in offsets[adjacency[current]]:
+                n = current + d
+                if n not in dist:
+                    r, c = divmod(n, cols)
+                    if r0 <= r < r1 and c0 <= c < c1:
+                        dist[n] = dist[current] + 1
+                        q.append(n)
+        return found
+
+    def refine(self, a, b):
+        # Cell path a .. b inside the cluster of a (a and b in the same cluster)
+        grid = self.grid
+        offsets, adjacency, cols = grid.offsets, grid.adjacency, grid.cols
+        r0, r1, c0, c1 = self.bounds(self.cluster_of(a))
+        parents = {a: None}
+        q = deque([a])
+        while q:
+            current = q.popleft()
+            self.expanded += 1
+            if current == b:
+                break
+            for d in offsets[adjacency[current]]:
+                n = current + d
+                if n not in parents:
+                    r, c = divmod(n, cols)
+                    if r0 <= r < r1 and c0 <= c < c1:
+                        parents[n] = current
+                        q.append(n)
+        path = []
+        node = b
+        while node is not None:
+            path.append(node)
+            node = parents[node]
+        path.reverse()
+        return path
+
+    def build(self):
+        # The whole abstract graph at once, instead of as searches reach it
+        st = time.perf_counter()
+        rows, cols = -(-self.grid.rows // self.cluster), -(-self.grid.cols // self.cluster)
+        for cr in range(rows):
+            for cc in range(cols):
+                self.graph((cr, cc))
+        self.build_time = time.perf_counter() - st
+        return self
+
+    def update_cell(self, i):
+        # Call after a barrier was set or cleared at cell i
+        self.version = self.grid.version
+        cr, cc = cluster = self.cluster_of(i)
+        for side in ("R", "D"):
+            self.borders.pop((cluster, side), None)
+        self.borders.pop(((cr, cc - 1), "R"), None)
+        self.borders.pop(((cr - 1, cc), "D"), None)
+        for k in (cluster, (cr + 1, cc), (cr - 1, cc), (cr, cc + 1), (cr, cc - 1)):
+            self.edges.pop(k, None)
+
+    def steps(self, start, end):
+        # A* over the abstract graph, yielding (current, opened) per abstract
+        # node; the returned path is refined to cells
+        result = SearchResult()
+        self.expanded = 0
+        grid = self.grid
+
+        # Temporary edges from start and into end, the cached graph is untouched
+        start_cluster, end_cluster = self.cluster_of(start), self.cluster_of(end)
+        targets = set(self.graph(start_cluster))
+        if start_cluster == end_cluster:
+            targets.add(end)
+        extra = {start: list(self.distances(start, start_cluster, targets).items())}
+        for n, d in self.distances(end, end_cluster, set(self.graph(end_cluster))).items():
+            extra.setdefault(n, []).append((end, d))
+
+        open_set = IndexedHeap()
+        # Ties on f go to the deeper node; the abstract graph has lots of
+        # equally good crossings and this keeps the search from fanning out
+        open_set.push(start, (h(grid, start, end), 0))
+        came_from = {start: None}
+        g_score = {start: 0}
+        while open_set:
+            current, _ = open_set.pop()
+            result.visited += 1
+            if current == end:
+                result.found = True
+                break
+
+            opened = []
+            edges = self.graph(self.cluster_of(current)).get(current, []) + extra.get(current, [])
+            result.neighbor_checks += len(edges)
+            for neighbor, cost in edges:
+                tentative = g_score[current] + cost
+                if tentative < g_score.get(neighbor, float("inf")):
+                    came_from[neighbor] = current
+                    g_score[neighbor] = tentative
+                    if neighbor not in open_set:
+                        opened.append(neighbor)
+                    open_set.push(neighbor, (tentative + h(grid, neighbor, end), -tentative))
+            yield current, opened
+
+        if result.found:
+            abstract = []
+            node = end
+            while node is not None:
+                abstract.append(node)
+                node = came_from[node]
+            abstract.reverse()
+            path = [start]
+            for a, b in zip(abstract, abstract[1:]):
+                if self.cluster_of(a) == self.cluster_of(b):
+                    path += self.refine(a, b)[1:]
+                else:
+                    path.append(b)  # one step across a border
+            result.path = path
+        # Work outside the abstract search: linking start/end, building
+        # newly reached clusters and refining the path
+        result.cluster_visited = self.expanded
+        result.count_queue(open_set)
+        return result
+
+
+def optimality_gap(result, optimal, grid=None):
+    # Extra path length relative to an optimal result, 0.0 when equal;
+    # with a grid, extra terrain cost instead
+    if not result.found or not optimal.path_len:
+        return 0.0
+    if grid is not None:
+        return grid.path_cost(result.path) / grid.path_cost(optimal.path) - 1
+    return result.path_len / optimal.path_len - 1
+
+
+_planners = weakref.WeakKeyDictionary()
+
+
+def hpa_for(grid):
+    # HPAStar of grid, started over once its barriers changed unreported
+    hpa = _planners.get(grid)
+    if hpa is None or hpa.version != grid.version:
+        hpa = _planners[grid] = HPAStar(grid)
+    return hpa
+
+
+def hpa_star_steps(grid, start, end):
+    # Through the registry: the abstract graph cached for grid
+    return (yield from hpa_for(grid).steps(start, end))
@@ -0,0 +1,102 @@
+from .grid import BARRIER
+from .heaps import IndexedHeap
+from .algorithms import SearchResult, h
+
+INF = float("inf")
+
+# --- INCREMENTAL REPLANNING (LPA*) ---
+# Lifelong Planning A* keeps its g/rhs values between searches. After the
+# caller toggles a few barriers and reports them with update_cell(), the
+# next search only re-expands cells whose shortest distance is affected,
+# so the cost of a replan scales with the size of the change instead of
+# the size of the grid. Start and end are fixed for the life of a planner.
+#
+#   g(u)    distance found by the last expansion of u
+#   rhs(u)  one-step lookahead: min over neighbors of g, plus the cost of u
+# A cell is queued while g != rhs (locally inconsistent).
+
+
+class LPAStar:
+    def __init__(self, grid, start, end):
+        self.grid = grid
+        self.start = start
+        self.end = end
+        self.g = {}
+        self.rhs = {start: 0}
+        self.open_set = IndexedHeap()
+        self.open_set.push(start, self.key(start))
+
+    def key(self, i):
+        m = min(self.g.get(i, INF), self.rhs.get(i, INF))
+        return (m + h(self.grid, i, self.end), m)
+
+    def update_vertex(self, u):
+        g = self.g
+        if u != self.start:
+            if self.grid.cells[u] == BARRIER:
+                self.rhs[u] = INF
+            else:
+                # Entering u costs its terrain cost, whichever neighbor we come from
+                self.rhs[u] = min((g.get(n, INF) for n in self.grid.neighbors(u)), default=INF) + self.grid.costs[u]
+        if g.get(u, INF) != self.rhs.get(u, INF):
+            self.open_set.update(u, self.key(u))
+        elif u in self.open_set:
+            self.open_set.remove(u)
+
+    def update_cell(self, i):
+        # Call after a barrier was set or cleared, or the terrain cost changed, at cell i
+        self.update_vertex(i)
+        for n in self.grid.adjacent(i):
+            self.update_vertex(n)
+
+    def steps(self):
+        # Step generator like the others: repairs the shortest-path tree,
+        # yielding (current, opened) per expansion, returns a SearchResult
+        result = SearchResult()
+        g, rhs, open_set, end = self.g, self.rhs, self.open_set, self.end
+        before = (open_set.pushes, open_set.pops, open_set.decrease_keys)
+
+        while open_set and (open_set.top()[1] < self.key(end) or
+                            rhs.get(end, INF) != g.get(end, INF)):
+            current, _ = open_set.pop()
+            result.visited += 1
+            if g.get(current, INF) > rhs.get(current, INF):
+                # Overconsistent: settle it, like a normal A* expansion
+                g[current] = rhs[current]
+            else:
+                # Underconsistent: its old distance is gone, re-derive it
+                g[current] = INF
+                self.update_vertex(current)
+            opened = []
+            # adjacent(), not neighbors(): current may have just become a barrier
+            adjacent = self.grid.adjacent(current)
+            result.neighbor_checks += len(adjacent)
+            for n in adjacent:
+                self.update_vertex(n)
+                if n in open_set:
+                    opened.append(n)
+            yield current, opened
+
+        result.pushes = open_set.pushes - before[0]
+        result.pops = open_set.pops - before[1]
+        result.decrease_keys = open_set.decrease_keys - before[2]
+        if g.get(end, INF) < INF:
+            result.found = True
+            result.path = self.path()
+        return result
+
+    def path(self):
+        # Walk from end to start along neighbors with the smallest g
+        g = self.g
+        path = [self.end]
+        current = self.end
+        while current != self.start:
+            current = min(self.grid.neighbors(current), key=lambda n: g.get(n, INF))
+            path.append(current)
+        path.reverse()
+        return path
+
+
+def lpa_star_steps(grid, start, end):
+    # One-shot use through the registry (a fresh planner every time)
+    return (yield from LPAStar(grid, start, end).steps())
@@ -0,0 +1,42 @@
+import time
+
+# --- INSTRUMENTATION ---
+# Wrappers around a step generator that measure only the search itself,
+# not what the caller does between steps (painting cells, drawing frames,
+# handling events). Both pass the steps and the SearchResult through
+# unchanged, so they stack and work with run() and the visualizer alike:
+#
+#   timing = {"search": 0.0}
+#   result = run(timed(ALGORITHMS["A*"](grid, s, e), timing))
+#
+#   profile = cProfile.Profile()
+#   result = run(profiled(steps, profile))
+#   profile.dump_stats("search.prof")
+
+
+def timed(steps, timing, key="search"):
+    # Adds the seconds spent inside the generator to timing[key]
+    clock = time.perf_counter
+    while True:
+        st = clock()
+        try:
+            item = next(steps)
+        except StopIteration as stop:
+            return stop.value
+        finally:
+            timing[key] = timing.get(key, 0) + clock() - st
+        yield item
+
+
+def profiled(steps, profile):
+    # Runs the generator under a cProfile.Profile, enabled only while a
+    # step is being computed
+    while True:
+        profile.enable()
+        try:
+            item = next(steps)
+        except StopIteration as stop:
+            return stop.value
+        finally:
+            profile.disable()
+        yield item
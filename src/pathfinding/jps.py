@@ -0,0 +1,157 @@
+from .grid import BARRIER
+from .heaps import IndexedHeap
+from .algorithms import SearchResult
+
+# --- JUMP POINT SEARCH ---
+# A* over jump points instead of single cells. On uniform-cost grids most
+# equal-length paths are symmetric; jumping straight until something
+# "interesting" happens (the goal, or a neighbor that can only be reached
+# optimally through this cell) skips them without touching the heap.
+#
+# 4-connected (default): vertical moves may turn horizontal anywhere, so
+# every vertical step scans left and right; horizontal moves only turn at
+# forced neighbors (the cell beside us is open but the one beside our
+# predecessor is not).
+# 8-connected (diagonal=True): classic JPS without corner cutting, with
+# octile distances (diagonal step costs sqrt(2)).
+
+SQRT2 = 2 ** 0.5
+
+
+def _sign(x):
+    return (x > 0) - (x < 0)
+
+
+def jps_steps(grid, start, end, diagonal=False, queue=IndexedHeap):
+    rows, cols, cells = grid.rows, grid.cols, grid.cells
+    end_r, end_c = divmod(end, cols)
+
+    def walkable(r, c):
+        # Every cell test during a jump counts as a neighbor check
+        result.neighbor_checks += 1
+        return 0 <= r < rows and 0 <= c < cols and cells[r * cols + c] != BARRIER
+
+    def jump_straight(r, c, dr, dc):
+        # Straight line until goal, forced neighbor or wall
+        while True:
+            r += dr
+            c += dc
+            if not walkable(r, c):
+                return None
+            if r == end_r and c == end_c:
+                return r * cols + c
+            if dc:
+                if (walkable(r - 1, c) and not walkable(r - 1, c - dc)) or \
+                   (walkable(r + 1, c) and not walkable(r + 1, c - dc)):
+                    return r * cols + c
+            elif diagonal:
+                if (walkable(r, c - 1) and not walkable(r - dr, c - 1)) or \
+                   (walkable(r, c + 1) and not walkable(r - dr, c + 1)):
+                    return r * cols + c
+            elif jump_straight(r, c, 0, 1) is not None or jump_straight(r, c, 0, -1) is not None:
+                # 4-connected vertical move: stop where a horizontal branch finds something
+                return r * cols + c
+
+    def jump_diagonal(r, c, dr, dc):
+        while True:
+            # No corner cutting: both orthogonal cells must be open
+            if not (walkable(r + dr, c) and walkable(r, c + dc) and walkable(r + dr, c + dc)):
+                return None
+            r += dr
+            c += dc
+            if r == end_r and c == end_c:
+                return r * cols + c
+            if jump_straight(r, c, dr, 0) is not None or jump_straight(r, c, 0, dc) is not None:
+                return r * cols + c
+
+    def directions(r, c, parent):
+        # Pruned set of directions to jump in from (r, c)
+        if parent is None:
+            if diagonal:
+                return [(dr, dc) for dr in (1, 0, -1) for dc in (1, 0, -1) if dr or dc]
+            return [(1, 0), (-1, 0), (0, 1), (0, -1)]
+        pr, pc = divmod(parent, cols)
+        dr, dc = _sign(r - pr), _sign(c - pc)
+        if dr and dc:
+            return [(dr, 0), (0, dc), (dr, dc)]
+        if not diagonal:
+            if dr:
+                return [(dr, 0), (0, 1), (0, -1)]
+            result = [(0, dc)]
+            for side in (1, -1):
+                if walkable(r + side, c) and not walkable(r + side, c - dc):
+                    result.append((side, 0))
+            return result
+        result = [(dr, dc)]
+        for side in (1, -1):
+            # Forced neighbors beside a straight move, plus the diagonal past them
+            sr, sc = (0, side) if dr else (side, 0)
+            if walkable(r + sr, c + sc) and not walkable(r + sr - dr, c + sc - dc):
+                result.append((sr, sc))
+                result.append((sr + dr, sc + dc))
+        return result
+
+    def h(i):
+        dr = abs(i // cols - end_r)
+        dc = abs(i % cols - end_c)
+        if diagonal:
+            return max(dr, dc) + (SQRT2 - 1) * min(dr, dc)
+        return dr + dc
+
+    result = SearchResult()
+    open_set = queue()
+    open_set.push(start, h(start))
+    came_from = {}
+    g_score = {start: 0}
+
+    while open_set:
+        current, _ = open_set.pop()
+        result.visited += 1
+
+        if current == end:
+            result.found = True
+            result.path = _expand_path(came_from, start, end, cols)
+            result.count_queue(open_set)
+            return result
+
+        r, c = divmod(current, cols)
+        opened = []
+        for dr, dc in directions(r, c, came_from.get(current)):
+            if dr and dc:
+                point = jump_diagonal(r, c, dr, dc)
+            else:
+                point = jump_straight(r, c, dr, dc)
+            if point is None:
+                continue
+            jr, jc = divmod(point, cols)
+            steps_r, steps_c = abs(jr - r), abs(jc - c)
+            step_cost = max(steps_r, steps_c) + (SQRT2 - 1) * min(steps_r, steps_c)
+            temp_g_score = g_score[current] + step_cost
+            if temp_g_score < g_score.get(point, float("inf")):
+                came_from[point] = current
+                g_score[point] = temp_g_score
+                if point not in open_set:
+                    opened.append(point)
+                open_set.push(point, temp_g_score + h(point))
+
+        yield current, opened
+    result.count_queue(open_set)
+    return result
+
+
+def _expand_path(came_from, start, end, cols):
+    # Fill in the straight/diagonal cells between consecutive jump points
+    points = [end]
+    while points[-1] != start:
+        points.append(came_from[points[-1]])
+    points.reverse()
+    path = [start]
+    for a, b in zip(points, points[1:]):
+        r, c = divmod(a, cols)
+        br, bc = divmod(b, cols)
+        dr, dc = _sign(br - r), _sign(bc - c)
+        while (r, c) != (br, bc):
+            r += dr
+            c += dc
+            path.append(r * cols + c)
+    return path
@@ -0,0 +1,88 @@
+import time
+import weakref
+from array import array
+
+import numpy as np
+
+from .wavefront import distance_field, UNREACHED
+from .components import ComponentIndex
+
+# --- LANDMARKS (ALT) ---
+# A* with landmarks and the triangle inequality: with d(L, x) the distance
+# from landmark L, every path from v to t is at least |d(L, t) - d(L, v)|
+# long, for every L. The largest of these bounds (and Manhattan) is an
+# admissible and consistent heuristic that knows about walls, so on mazes
+# it stays close to the real distance where Manhattan is far off.
+#
+# Landmarks are spread by farthest-point selection, each one the cell
+# farthest from those picked so far; every distance field is one
+# vectorized BFS (wavefront.py). The fields count steps, which never
+# overestimates on weighted maps either (every step costs at least 1).
+# Cells the landmarks can't reach (other components) fall back to
+# Manhattan. Needs numpy (imported on demand).
+#
+# The fields are kept as flat int arrays and the heuristic is computed per
+# cell when the search asks for it, so a query only pays for the cells it
+# touches, like A* does.
+
+LANDMARKS = 8
+
+
+class Landmarks:
+    def __init__(self, grid, count=LANDMARKS):
+        self.grid = grid
+        self.count = count
+        self.build()
+
+    def build(self):
+        grid = self.grid
+        st = time.perf_counter()
+        self.version = grid.version
+        self.cells = []
+        fields = []
+        # Start in the biggest component, so small pockets don't take landmarks
+        index = ComponentIndex(grid)
+        if index.sizes:
+            biggest = max(index.sizes, key=index.sizes.get)
+            seed = index.labels.index(biggest)
+            nearest = distance_field(grid, seed).ravel()
+            for _ in range(self.count):
+                landmark = int(nearest.argmax())
+                if landmark in self.cells:
+                    break
+                field = distance_field(grid, landmark).ravel()
+                self.cells.append(landmark)
+                fields.append(field)
+                nearest = np.minimum(nearest, field)
+        self.fields = [array("i", field.astype(np.int32).tobytes()) for field in fields]
+        self.build_time = time.perf_counter() - st
+
+    def heuristic(self, end):
+        # h(i) towards end, as a function of the cell alone. Only landmarks
+        # that reach end count; a cell they don't reach is in another
+        # component than end, which the search only gets to when there is
+        # no path anyway.
+        cols = self.grid.cols
+        er, ec = divmod(end, cols)
+        bounds = [(field, field[end]) for field in self.fields if field[end] != UNREACHED]
+
+        def heuristic(i):
+            r, c = divmod(i, cols)
+            best = abs(r - er) + abs(c - ec)
+            for field, d in bounds:
+                bound = abs(field[i] - d)
+                if bound > best:
+                    best = bound
+            return best
+        return heuristic
+
+
+_landmarks = weakref.WeakKeyDictionary()
+
+
+def landmarks_for(grid, count=LANDMARKS):
+    # Landmarks of grid, rebuilt once its barriers changed
+    landmarks = _landmarks.get(grid)
+    if landmarks is None or landmarks.version != grid.version or landmarks.count != count:
+        landmarks = _landmarks[grid] = Landmarks(grid, count)
+    return landmarks
@@ -0,0 +1,111 @@
+import mmap
+import struct
+import zlib
+
+import numpy as np
+
+from .grid import Grid, EMPTY, BARRIER
+
+# --- MAP FILES ---
+# Binary map format (.pfm), little-endian:
+#
+#   magic "PFMP", version, flags, rows, cols, start, end, crc32
+#   payload: one bit per cell (1 = barrier), row-major, lowest bit first
+#   with the WEIGHTED flag: one terrain cost byte per cell after that
+#
+# start/end are cell indices, -1 when the map has none. The checksum
+# covers the header fields before it and the payload. Loading maps the
+# file into memory and unpacks the bits straight from the mapping into
+# the grid, so a map of millions of cells loads without parsing or
+# intermediate copies. Needs numpy (`from pathfinding.mapfile import
+# load_map`).
+#
+# MovingAI benchmark maps (.map) and scenarios (.scen) can be imported
+# with load_movingai() and load_scenarios().
+
+MAGIC = b"PFMP"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIqqI")
+WEIGHTED = 1  # flag: terrain costs follow the barrier bits
+
+# MovingAI terrain: ". G S" are passable, everything else (@ O T W) blocks
+_MOVINGAI = bytes(EMPTY if chr(c) in ".GS" else BARRIER for c in range(256))
+
+
+def save_map(path, grid, start=None, end=None):
+    bits = np.frombuffer(grid.cells, dtype=np.uint8) == BARRIER
+    payload = np.packbits(bits, bitorder="little").tobytes()
+    flags = 0
+    if grid.is_weighted():
+        flags |= WEIGHTED
+        payload += grid.costs
+    fields = (MAGIC, VERSION, flags, grid.rows, grid.cols,
+              -1 if start is None else start, -1 if end is None else end)
+    crc = zlib.crc32(payload, zlib.crc32(HEADER.pack(*fields, 0)[:-4]))
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(*fields, crc))
+        file.write(payload)
+
+
+def load_map(path):
+    # Returns (grid, start, end); start/end are None when not stored
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if len(mm) < HEADER.size:
+            raise ValueError(f"{path}: not a map file")
+        magic, version, flags, rows, cols, start, end, crc = HEADER.unpack_from(mm)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a map file (or unsupported version)")
+        size = rows * cols
+        cells = bytearray(size)
+        costs = None
+        nbytes = (size + 7) // 8
+        if flags & WEIGHTED:
+            nbytes += size
+        view = memoryview(mm)
+        payload = view[HEADER.size:HEADER.size + nbytes]
+        try:
+            if len(payload) < nbytes or zlib.crc32(payload, zlib.crc32(view[:HEADER.size - 4])) != crc:
+                raise ValueError(f"{path}: checksum mismatch, file is damaged")
+            # Bits are 0/1 and so are EMPTY/BARRIER: unpack into the cells directly
+            np.frombuffer(cells, dtype=np.uint8)[:] = np.unpackbits(
+                np.frombuffer(payload, dtype=np.uint8), count=size, bitorder="little")
+            if flags & WEIGHTED:
+                costs = bytearray(payload[nbytes - size:])
+        finally:
+            # The mapping can only close once nothing points into it
+            payload.release()
+            view.release()
+    return Grid(rows, cols, cells, costs), (None if start < 0 else start), (None if end < 0 else end)
+
+
+def load_movingai(path):
+    # MovingAI .map: "type", "height", "width" lines, then "map" and the rows
+    with open(path, "rb") as file:
+        header = {}
+        for line in file:
+            line = line.strip()
+            if line == b"map":
+                break
+            key, _, value = line.partition(b" ")
+            header[key.decode()] = value.decode()
+        rows, cols = int(header["height"]), int(header["width"])
+        data = b"".join(line.rstrip(b"\r\n") for line in file)
+    if len(data) != rows * cols:
+        raise ValueError(f"{path}: expected {rows}x{cols} cells, got {len(data)}")
+    return Grid(rows, cols, bytearray(data.translate(_MOVINGAI)))
+
+
+def load_scenarios(path):
+    # MovingAI .scen, version 1: one query per line as
+    # bucket, map, width, height, start x, start y, goal x, goal y, optimal length
+    # Returns [(map name, (row, col), (row, col), optimal length)]. The
+    # optimal length is for 8-connected moves with diagonal cost sqrt(2).
+    scenarios = []
+    with open(path) as file:
+        for line in file:
+            fields = line.split()
+            if len(fields) != 9:
+                continue  # "version" line
+            _, name, _, _, sx, sy, gx, gy, optimal = fields
+            scenarios.append((name, (int(sy), int(sx)), (int(gy), int(gx)), float(optimal)))
+    return scenarios
@@ -0,0 +1,67 @@
+from .grid import Grid, BARRIER
+
+# --- PRE-MADE MAPS ---
+# The maps behind the visualizer's Maze and Spiral buttons and the other
+# generator families (generators.py), available by name to the headless
+# CLI (python src/main.py --headless). 50x50 unless a size is given.
+#
+# Empty, Maze and Spiral are built right here in pure Python, so they don't
+# load numpy; the other families import generators.py when asked for. The
+# maze/spiral patterns there are drawn by the same functions.
+
+MAPS = ("empty", "random", "backtracker", "rooms", "maze", "spiral")  # generators.FAMILIES
+
+
+def _scale(x, size):
+    # Position x on the 50-cell original, at size cells
+    return min(round(x * size / 50), size - 1)
+
+
+def _wall(cells, cols, row, c0, c1):
+    # Barriers in row from column c0 up to c1, one slice write
+    i = row * cols
+    cells[i + c0:i + c1] = bytes([BARRIER]) * (c1 - c0)
+
+
+def maze_pattern(cells, rows, cols):
+    # Every odd row a wall from column 5 to 44 (of 50)
+    c5, c45 = _scale(5, cols), _scale(45, cols)
+    for row in range(1, rows, 2):
+        _wall(cells, cols, row, c5, c45)
+
+
+def spiral_pattern(cells, rows, cols):
+    c5, c15, c35, c45 = (_scale(x, cols) for x in (5, 15, 35, 45))
+    r10, r20, r40, r41 = (_scale(x, rows) for x in (10, 20, 40, 41))
+    _wall(cells, cols, r10, c5, c45)  # Top
+    _wall(cells, cols, r40, c5, c45)  # Bottom
+    for row in range(r10, r41):
+        cells[row * cols + c5] = BARRIER   # Left
+        cells[row * cols + c45] = BARRIER  # Right
+    _wall(cells, cols, r20, c15, c35)
+
+
+def generate_map_1(grid): # Simple Maze
+    maze_pattern(grid.cells, grid.rows, grid.cols)
+    grid.rebuild_adjacency()
+
+
+def generate_map_2(grid): # Spiral
+    spiral_pattern(grid.cells, grid.rows, grid.cols)
+    grid.rebuild_adjacency()
+
+
+BUILT_IN = {
+    "empty": lambda grid: None,
+    "maze": generate_map_1,
+    "spiral": generate_map_2,
+}
+
+
+def premade(name, rows=50, cols=None, seed=None):
+    if name in BUILT_IN:
+        grid = Grid(rows, cols)
+        BUILT_IN[name](grid)
+        return grid
+    from .generators import generate_grid
+    return generate_grid(name, rows, cols, seed)
@@ -0,0 +1,56 @@
+from .algorithms import SearchResult, astar_steps, dijkstra_steps, bfs_steps, run
+from .heaps import BucketQueue
+from .jps import jps_steps
+from .bidirectional import bidirectional_bfs_steps, bidirectional_astar_steps
+from .incremental import lpa_star_steps
+from .hierarchical import hpa_star_steps
+
+def dial_steps(grid, start, end):
+    # Dijkstra on Dial's bucket queue instead of a binary heap
+    return dijkstra_steps(grid, start, end, BucketQueue)
+
+
+def dial_astar_steps(grid, start, end):
+    return astar_steps(grid, start, end, BucketQueue)
+
+
+def wavefront_steps(grid, start, end):
+    # NumPy is only imported once this algorithm is actually used
+    from .wavefront import wavefront_steps as steps
+    return (yield from steps(grid, start, end))
+
+
+def alt_steps(grid, start, end):
+    # A* with the landmark heuristic; landmarks are built once per map
+    # version and cached (numpy, imported on first use like Wavefront)
+    from .landmarks import landmarks_for
+    heuristic = landmarks_for(grid).heuristic(end)
+    return (yield from astar_steps(grid, start, end, heuristic=heuristic))
+
+
+# Step generators by the names shown in the visualizer panel and written
+# to results.csv
+ALGORITHMS = {
+    "A*": astar_steps,
+    "Dijkstra": dijkstra_steps,
+    "BFS": bfs_steps,
+    "JPS": jps_steps,
+    "Bi-BFS": bidirectional_bfs_steps,
+    "Bi-A*": bidirectional_astar_steps,
+    "LPA*": lpa_star_steps,
+    "Wavefront": wavefront_steps,
+    "HPA*": hpa_star_steps,
+    "Dial": dial_steps,
+    "Dial-A*": dial_astar_steps,
+    "ALT": alt_steps,
+}
+
+
+def search(name, grid, start, end, components=None):
+    # components: optional ComponentIndex of grid. Queries between different
+    # components are answered without searching.
+    if components is not None and not components.connected(start, end):
+        result = SearchResult()
+        result.unreachable = True
+        return result
+    return run(ALGORITHMS[name](grid, start, end))
@@ -0,0 +1,187 @@
+import json
+import time
+import asyncio
+from collections import deque
+
+from .batch import BatchSolver, percentile
+
+# --- QUERY SERVICE ---
+# A BatchSolver behind a small local HTTP service (asyncio, no framework):
+#
+#   POST /paths   {"queries": [[start, end], ...]}  ->  {"paths": [[...], ...]}
+#   GET  /stats   throughput and latency so far, and the map size
+#
+# Cells are indexes, row * cols + col; a path is a list of them, [] if
+# there is none. Requests that arrive within WINDOW seconds of each other
+# are answered by one batch, so concurrent clients share single-source
+# searches (and the worker pool) instead of queueing one by one; a batch
+# starts early once it holds MAX_BATCH queries. Batches run one at a time
+# in a thread, the event loop keeps accepting requests meanwhile.
+#
+# Latency is per request, from reading it to having its paths; p50/p99
+# are over the last LATENCIES requests.
+#
+#   python src/main.py --serve 8700 --map rooms --rows 400 --workers 4
+#   curl -d '{"queries": [[0, 159999]]}' localhost:8700/paths
+
+WINDOW = 0.005
+MAX_BATCH = 10000
+LATENCIES = 10000
+
+
+class QueryService:
+    def __init__(self, solver, window=WINDOW, max_batch=MAX_BATCH):
+        self.solver = solver
+        self.window = window
+        self.max_batch = max_batch
+        self.pending = []  # (queries, future, arrival)
+        self.flush = None
+        self.running = set()  # batch tasks, referenced until they are done
+        self.lock = asyncio.Lock()
+        self.started = time.perf_counter()
+        self.busy = 0.0
+        self.requests = 0
+        self.queries = 0
+        self.batches = 0
+        self.latencies = deque(maxlen=LATENCIES)
+
+    async def paths(self, queries):
+        # Paths for one request's queries, batched with whatever else arrives
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((queries, future, time.perf_counter()))
+        if sum(len(q) for q, _, _ in self.pending) >= self.max_batch:
+            self._flush_now()
+        elif self.flush is None:
+            self.flush = self._start(self._flush_later())
+        return await future
+
+    def _flush_now(self):
+        if self.flush is not None:
+            self.flush.cancel()
+        self.flush = None
+        batch, self.pending = self.pending, []
+        self._start(self._run(batch))
+
+    def _start(self, coro):
+        # The loop only keeps weak references to tasks
+        task = asyncio.create_task(coro)
+        self.running.add(task)
+        task.add_done_callback(self.running.discard)
+        return task
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.window)
+        self.flush = None
+        batch, self.pending = self.pending, []
+        await self._run(batch)
+
+    async def _run(self, batch):
+        queries = [q for qs, _, _ in batch for q in qs]
+        async with self.lock:
+            st = time.perf_counter()
+            try:
+                paths, _ = await asyncio.to_thread(self.solver.solve, queries)
+            except Exception as err:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(err)
+                return
+            done = time.perf_counter()
+            self.busy += done - st
+        self.batches += 1
+        k = 0
+        for qs, future, arrival in batch:
+            self.requests += 1
+            self.queries += len(qs)
+            self.latencies.append(done - arrival)
+            if not future.done():
+                future.set_result([p.tolist() for p in paths[k:k + len(qs)]])
+            k += len(qs)
+
+    def stats(self):
+        latencies = list(self.latencies)
+        grid = self.solver.grid
+        return {
+            "rows": grid.rows,
+            "cols": grid.cols,
+            "workers": self.solver.workers,
+            "startup_s": self.solver.startup,
+            "requests": self.requests,
+            "queries": self.queries,
+            "batches": self.batches,
+            "uptime_s": time.perf_counter() - self.started,
+            "busy_s": self.busy,
+            # Queries per second of solving, what the service can sustain
+            "qps": self.queries / self.busy if self.busy else 0,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+        }
+
+    def _parse(self, body):
+        # Query list of a POST /paths body; ValueError if malformed
+        queries = json.loads(body)["queries"]
+        size = self.solver.grid.size
+        parsed = []
+        for query in queries:
+            start, end = query
+            # bool is an int subclass, but true/false are not cells
+            if not all(type(i) is int and 0 <= i < size for i in (start, end)):
+                raise ValueError(f"not a pair of cell indexes below {size}: {query!r}")
+            parsed.append((start, end))
+        return parsed
+
+    async def handle(self, reader, writer):
+        # One HTTP/1.1 request per connection
+        try:
+            request = await reader.readline()
+            method, target, _ = request.decode("latin-1").split(" ", 2)
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.strip().lower() == "content-length":
+                    length = int(value)
+            body = await reader.readexactly(length) if length else b""
+        except (ValueError, asyncio.IncompleteReadError):
+            await self._respond(writer, 400, {"error": "bad request"})
+            return
+
+        if method == "GET" and target == "/stats":
+            await self._respond(writer, 200, self.stats())
+        elif method == "POST" and target == "/paths":
+            try:
+                queries = self._parse(body)
+            except (ValueError, TypeError, KeyError) as err:
+                await self._respond(writer, 400, {"error": str(err)})
+                return
+            try:
+                paths = await self.paths(queries)
+            except Exception as err:
+                await self._respond(writer, 500, {"error": f"batch failed: {err!r}"})
+                return
+            await self._respond(writer, 200, {"paths": paths})
+        else:
+            await self._respond(writer, 404, {"error": f"no route {method} {target}"})
+
+    @staticmethod
+    async def _respond(writer, status, payload):
+        body = json.dumps(payload).encode()
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}[status]
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+
+async def serve(grid, port, host="127.0.0.1", workers=None, window=WINDOW):
+    # Runs until cancelled (Ctrl+C)
+    with BatchSolver(grid, workers) as solver:
+        service = QueryService(solver, window)
+        server = await asyncio.start_server(service.handle, host, port)
+        async with server:
+            print(f"serving {grid.rows}x{grid.cols} on http://{host}:{port} ({solver.workers} workers)")
+            await server.serve_forever()
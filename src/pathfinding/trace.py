@@ -0,0 +1,148 @@
+import zipfile
+from array import array
+
+import numpy as np
+
+from .grid import EMPTY, OPEN, CLOSED, PATH
+
+# --- SEARCH TRACES ---
+# What a search did, step by step, in three flat int arrays: the expanded
+# cell of every step (-1 for Wavefront, which expands whole layers), how
+# many cells every step opened, and all opened cells back to back. Plus
+# the final path. recorded() fills one from any step generator, like
+# timed()/profiled() do (instrument.py):
+#
+#   trace = Trace("A*", grid.rows, grid.cols, s, e)
+#   result = run(recorded(ALGORITHMS["A*"](grid, s, e), trace))
+#
+# That costs under a microsecond per step: 5-35% on top of the searches
+# here, more for BFS, whose steps are hardly more than the appends. Callers
+# that look at every step anyway (the visualizer) call step() themselves,
+# outside the timed search.
+#
+# A replay never runs the search again. cells(base, frame) computes the
+# cell states after any number of frames (steps, then the path one cell
+# per frame) in a few array operations, from the step each cell was
+# first opened and first expanded in, so it can jump anywhere at any
+# speed. Traces are saved with save_traces() as a compressed .npz, several
+# algorithms per file. Needs numpy (`from pathfinding.trace import Trace`).
+#
+# A trace only fits the map it was recorded on. revision, the map's
+# (grid.version, grid.cost_version) at the time, tells matches() whether
+# it still is; it is not saved, as versions only count edits in a session.
+
+NEVER = np.iinfo(np.int32).max
+
+
+class Trace:
+    def __init__(self, algo, rows, cols, start, end, revision=None):
+        self.algo = algo
+        self.rows, self.cols = rows, cols
+        self.start, self.end = start, end
+        self.revision = revision  # None: fits any map of the size
+        self.expanded = array("i")  # per step, -1 if no single cell
+        self.counts = array("i")    # per step, number of opened cells
+        self.opened = array("i")
+        self.path = array("i")
+        self._timeline = None
+
+    def __len__(self):
+        # Number of steps
+        return len(self.expanded)
+
+    @property
+    def frames(self):
+        # Steps plus one frame per path cell
+        return len(self.expanded) + len(self.path)
+
+    def step(self, current, opened):
+        self.expanded.append(-1 if current is None else current)
+        self.counts.append(len(opened))
+        self.opened.extend(opened)
+
+    def finish(self, result):
+        self.path = array("i", result.path)
+
+    def matches(self, grid, start, end):
+        if self.revision is not None and self.revision != (grid.version, grid.cost_version):
+            return False
+        return (self.rows, self.cols, self.start, self.end) == (grid.rows, grid.cols, start, end)
+
+    def timeline(self):
+        # Per cell: step in which it was first opened / first expanded
+        # (NEVER if not at all), and its position on the path drawn back
+        # from the end
+        if self._timeline is None:
+            size = self.rows * self.cols
+            steps = np.arange(len(self.expanded), dtype=np.int32)
+            opened_at = np.full(size, NEVER, dtype=np.int32)
+            closed_at = np.full(size, NEVER, dtype=np.int32)
+            opened = np.frombuffer(self.opened, dtype=np.int32)
+            # Written in reverse, so the first step wins
+            opened_at[opened[::-1]] = np.repeat(steps, np.frombuffer(self.counts, dtype=np.int32))[::-1]
+            expanded = np.frombuffer(self.expanded, dtype=np.int32)
+            real = expanded >= 0
+            closed_at[expanded[real][::-1]] = steps[real][::-1]
+            path_at = np.full(size, NEVER, dtype=np.int32)
+            path = np.frombuffer(self.path, dtype=np.int32)[::-1]
+            path_at[path] = np.arange(path.size, dtype=np.int32)
+            self._timeline = opened_at, closed_at, path_at
+        return self._timeline
+
+    def cells(self, base, frame):
+        # Cell states after frame frames, painted over base (the map without
+        # search marks) as a uint8 array; only EMPTY cells are painted
+        opened_at, closed_at, path_at = self.timeline()
+        base = np.frombuffer(base, dtype=np.uint8)
+        free = base == EMPTY
+        step = min(frame, len(self.expanded))
+        cells = base.copy()
+        cells[free & (opened_at < step)] = OPEN
+        cells[free & (closed_at < step)] = CLOSED
+        cells[free & (path_at < frame - len(self.expanded))] = PATH
+        return cells
+
+
+def recorded(steps, trace):
+    # Appends every step of the generator to trace, passes it through.
+    # Same as step()/finish(), inlined
+    expanded, counts, opened = trace.expanded.append, trace.counts.append, trace.opened.extend
+    while True:
+        try:
+            current, new = next(steps)
+        except StopIteration as stop:
+            trace.path = array("i", stop.value.path)
+            return stop.value
+        expanded(-1 if current is None else current)
+        counts(len(new))
+        opened(new)
+        yield current, new
+
+
+def save_traces(file, traces):
+    # file: path or binary file object; traces: list of Trace
+    arrays = {"algos": np.array([t.algo for t in traces], dtype=str)}
+    for k, t in enumerate(traces):
+        arrays[f"{k}.meta"] = np.array([t.rows, t.cols, t.start, t.end], dtype=np.int64)
+        for name in ("expanded", "counts", "opened", "path"):
+            arrays[f"{k}.{name}"] = np.frombuffer(getattr(t, name), dtype=np.int32)
+    if isinstance(file, str):
+        with open(file, "wb") as f:
+            np.savez_compressed(f, **arrays)
+    else:
+        np.savez_compressed(file, **arrays)
+
+
+def load_traces(file):
+    try:
+        data = np.load(file)
+        algos = data["algos"].tolist()
+        traces = []
+        for k, algo in enumerate(algos):
+            t = Trace(algo, *data[f"{k}.meta"].tolist())
+            for name in ("expanded", "counts", "opened", "path"):
+                setattr(t, name, array("i", data[f"{k}.{name}"].astype(np.int32).tobytes()))
+            traces.append(t)
+    except (KeyError, ValueError, zipfile.BadZipFile) as err:
+        raise ValueError(f"{file}: not a trace file ({err})") from err
+    return traces
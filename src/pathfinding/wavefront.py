@@ -0,0 +1,93 @@
+import numpy as np
+
+from .grid import BARRIER, DOWN, UP, RIGHT, LEFT
+from .algorithms import SearchResult
+
+# --- VECTORIZED WAVEFRONT BFS ---
+# BFS one whole frontier at a time with NumPy instead of one cell at a time
+# in Python. The frontier is an array of cell indices; every layer reads
+# the grid's adjacency masks for all of them at once, collects the four
+# shifted index arrays, drops already labeled cells and duplicates, and
+# labels the rest with the next distance. Needs numpy (imported on demand:
+# `from pathfinding.wavefront import distance_field`).
+
+UNREACHED = -1
+# Open neighbors per adjacency mask
+_DEGREE = np.array([bin(mask).count("1") for mask in range(16)], dtype=np.intp)
+
+
+def _layers(grid, source, end=None):
+    # Yields (distance array, new layer) per BFS layer; stops early once
+    # end is labeled. The distance array is flat and filled in place.
+    adjacency = np.frombuffer(grid.adjacency, dtype=np.uint8)
+    dist = np.full(grid.size, UNREACHED, dtype=np.int32)
+    if grid.cells[source] == BARRIER:
+        return
+    cols = grid.cols
+    bits = np.array([DOWN, UP, RIGHT, LEFT], dtype=np.uint8)
+    steps = np.array([cols, -cols, 1, -1], dtype=np.intp)
+    slot = np.empty(grid.size, dtype=np.intp)  # scratch for de-duplication
+    dist[source] = 0
+    frontier = np.array([source], dtype=np.intp)
+    yield dist, frontier
+    d = 0
+    while frontier.size and (end is None or dist[end] == UNREACHED):
+        d += 1
+        # All four directions at once: (frontier, 4) candidates, kept where
+        # the adjacency bit says that neighbor is open
+        open_dirs = (adjacency[frontier][:, None] & bits) != 0
+        layer = (frontier[:, None] + steps)[open_dirs]
+        layer = layer[dist[layer] == UNREACHED]
+        # Keep one copy of each cell: with repeated indices the last write
+        # wins, so exactly one position per cell reads back its own number
+        order = np.arange(layer.size)
+        slot[layer] = order
+        layer = layer[slot[layer] == order]
+        dist[layer] = d
+        frontier = layer
+        yield dist, layer
+
+
+def distance_field(grid, source):
+    # BFS distance from source to every cell as a (rows, cols) int32 array,
+    # UNREACHED (-1) for barriers and cells that cannot be reached
+    dist = np.full(grid.size, UNREACHED, dtype=np.int32)
+    for dist, _ in _layers(grid, source):
+        pass
+    return dist.reshape(grid.rows, grid.cols)
+
+
+def descend(grid, field, end):
+    # Path from the field's source to end, found by stepping from end to a
+    # neighbor one closer each time. [] if end is unreachable.
+    flat = field.ravel()
+    d = int(flat[end])
+    if d < 0:
+        return []
+    path = [end]
+    current = end
+    while d > 0:
+        d -= 1
+        for n in grid.neighbors(current):
+            if flat[n] == d:
+                current = n
+                break
+        path.append(current)
+    path.reverse()
+    return path
+
+
+def wavefront_steps(grid, start, end):
+    # Step generator for the registry: yields (None, layer) per BFS layer,
+    # there is no single current cell when a whole frontier expands at once
+    result = SearchResult()
+    adjacency = np.frombuffer(grid.adjacency, dtype=np.uint8)
+    dist = None
+    for dist, layer in _layers(grid, start, end):
+        result.visited += int(layer.size)
+        result.neighbor_checks += int(_DEGREE[adjacency[layer]].sum())
+        yield None, layer.tolist()
+    if dist is not None and dist[end] != UNREACHED:
+        result.found = True
+        result.path = descend(grid, dist, end)
+    return result
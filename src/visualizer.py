@@ -0,0 +1,870 @@
+import os
+import math
+import json
+import cProfile
+import pstats
+import pygame
+import time
+import numpy as np
+from pathfinding import Grid, ALGORITHMS, SearchResult, LPAStar, HPAStar, PathCache, astar, timed, profiled, EMPTY, BARRIER, START, END, OPEN, CLOSED, PATH, MIN_COST, MAX_COST
+from pathfinding.wavefront import distance_field
+from pathfinding.components import ComponentIndex
+from pathfinding.landmarks import landmarks_for
+from pathfinding.mapfile import save_map, load_map
+from pathfinding.maps import premade
+from pathfinding.trace import Trace, save_traces, load_traces
+
+# --- SETTINGS & COLORS ---
+WIDTH = 1000  # Window Width (800 Grid + 200 Panel)
+HEIGHT = 800  # Window Height
+GRID_WIDTH = 800
+ROWS = 50     # Default grid size (rows = cols), python src/main.py --rows N
+FPS = 60
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+MAP_FILE = os.path.join(DATA_DIR, "saved.pfm")
+TRACE_FILE = os.path.join(DATA_DIR, "saved.trace")  # traces of the saved map's runs
+METRICS_FILE = os.path.join(DATA_DIR, "metrics.json")  # Export button
+PROFILE_FILE = os.path.join(DATA_DIR, "search.prof")   # Profile toggle, last run
+FRAME_BUDGET = 0.6 / FPS  # Share of each frame spent advancing the search
+# Search steps per frame for each position of the speed slider
+SPEEDS = [1, 2, 5, 10, 25, 50, 100, 250, 1000, 10 ** 9]
+MAX_SCALE = 64  # Most pixels per cell when zoomed in
+LINE_SCALE = 6  # Grid lines only from this many pixels per cell
+ZOOM_STEP = 1.25
+PAN_STEP = 0.25  # Arrow keys move a quarter of the view
+GENERATED = ["random", "backtracker", "rooms"]  # map families the G key cycles through
+
+# Colors (RGB)
+RED = (255, 0, 0)         # Closed Nodes
+GREEN = (0, 255, 0)       # Open Nodes
+WHITE = (255, 255, 255)   # Empty
+BLACK = (0, 0, 0)         # Barrier/Wall
+PURPLE = (128, 0, 128)    # End Node
+ORANGE = (255, 165, 0)    # Start Node
+GREY = (128, 128, 128)    # Grid Lines
+TURQUOISE = (64, 224, 208) # Path
+HEAT_NEAR = (255, 235, 110) # Heatmap, close to start
+HEAT_FAR = (60, 70, 200)    # Heatmap, far from start
+MUD = (140, 100, 55)        # Empty cell at MAX_COST terrain
+PANEL_COLOR = (40, 40, 40) # Right Panel Background
+OUTSIDE = (70, 70, 70)     # Grid area beyond the edge of the map
+TEXT_COLOR = (255, 255, 255)
+
+# Window and fonts, created by open_window() and not at import time
+WIN = None
+FONT = None
+HEADER_FONT = None
+
+# State -> color, indexed by the cell states stored in the Grid
+COLORS = [WHITE, BLACK, ORANGE, PURPLE, GREEN, RED, TURQUOISE]
+# Terrain cost -> color of an empty cell, from WHITE (MIN_COST) to MUD
+TERRAIN = [tuple(round(w + (m - w) * max(cost - MIN_COST, 0) / (MAX_COST - MIN_COST))
+                 for w, m in zip(WHITE, MUD))
+           for cost in range(MAX_COST + 1)]
+# The renderer draws through an 8-bit palette: a cell's color index is
+# cost << 3 | state, or HEAT_CODE + its distance level with the heatmap on
+HEAT_CODE = 128
+HEAT_LEVELS = 64
+PALETTE = [TERRAIN[code >> 3] if code & 7 == EMPTY else COLORS[min(code & 7, PATH)]
+           for code in range((MAX_COST + 1) << 3)]
+PALETTE += [BLACK] * (HEAT_CODE - len(PALETTE))
+PALETTE += [tuple(round(n + (f - n) * level / (HEAT_LEVELS - 1)) for n, f in zip(HEAT_NEAR, HEAT_FAR))
+            for level in range(HEAT_LEVELS)]
+PALETTE += [BLACK] * (256 - len(PALETTE))
+# States the heatmap paints over
+HEATED = np.array([state in (EMPTY, OPEN, CLOSED) for state in range(8)])
+
+# --- NODE CLASS ---
+# A Node is only a thin view over one cell of the array-backed Grid; the
+# state itself is a byte in grid.cells. Views are cheap to create and are
+# only used for the cells the user interacts with. Writes go through
+# grid.set_state so the grid's adjacency stays current.
+class Node:
+    __slots__ = ("grid", "index", "row", "col")
+
+    def __init__(self, grid, row, col):
+        self.grid = grid
+        self.row = row
+        self.col = col
+        self.index = grid.index(row, col)
+
+    def get_pos(self):
+        return self.row, self.col
+
+    def is_closed(self):
+        return self.grid.cells[self.index] == CLOSED
+
+    def is_open(self):
+        return self.grid.cells[self.index] == OPEN
+
+    def is_barrier(self):
+        return self.grid.cells[self.index] == BARRIER
+
+    def is_start(self):
+        return self.grid.cells[self.index] == START
+
+    def is_end(self):
+        return self.grid.cells[self.index] == END
+
+    def reset(self):
+        self.grid.set_state(self.index, EMPTY)
+
+    def make_start(self):
+        self.grid.set_state(self.index, START)
+
+    def make_closed(self):
+        self.grid.set_state(self.index, CLOSED)
+
+    def make_open(self):
+        self.grid.set_state(self.index, OPEN)
+
+    def make_barrier(self):
+        self.grid.set_state(self.index, BARRIER)
+
+    def make_end(self):
+        self.grid.set_state(self.index, END)
+
+    def make_path(self):
+        self.grid.set_state(self.index, PATH)
+
+    def __eq__(self, other):
+        return isinstance(other, Node) and other.index == self.index
+
+    def __hash__(self):
+        return self.index
+
+# --- ALGORITHMS ---
+# The search itself lives in the headless pathfinding package and runs
+# directly on the GUI grid. animate() wraps one of its step generators and
+# colors cells as it advances, then walks the path; it yields once per step
+# so the main loop decides how many steps fit in a frame.
+
+def animate(steps, grid, start, end, trace=None):
+    # trace: optional Trace that records the run for replays (R, V)
+    cells = grid.cells
+    while True:
+        try:
+            current, opened = next(steps)
+        except StopIteration as stop:
+            result = stop.value
+            break
+        if trace is not None:
+            trace.step(current, opened)
+        for i in opened:
+            cells[i] = OPEN
+        # Wavefront expands a whole layer per step and has no current cell
+        if current is not None and current != start.index:
+            cells[current] = CLOSED
+        yield
+
+    # Path coloring, end back to start as before
+    for i in reversed(result.path[:-1]):
+        cells[i] = PATH
+        yield
+    end.make_end()
+    if trace is not None:
+        trace.finish(result)
+    return result
+
+def advance(animation, max_steps, budget):
+    # Run up to max_steps of the animation or until the time budget is used.
+    # Returns the SearchResult once the animation is finished, else None.
+    deadline = time.perf_counter() + budget
+    try:
+        for _ in range(max_steps):
+            next(animation)
+            if time.perf_counter() > deadline:
+                break
+    except StopIteration as stop:
+        return stop.value
+    return None
+
+# --- REPLAY ---
+# Plays recorded runs (pathfinding/trace.py) back without searching again.
+# Every frame is computed from the traces for the current frame number, so
+# a replay runs at any speed and can be scrubbed back and forth. A second
+# trace is shown on a copy of the grid, next to the first.
+class Replay:
+    def __init__(self, grid, traces):
+        grid.clear_marks()
+        self.base = bytes(grid.cells)
+        self.traces = traces
+        self.grids = [grid] + [Grid(grid.rows, grid.cols, bytearray(self.base), grid.costs)
+                               for _ in traces[1:]]
+        self.frames = max(t.frames for t in traces)
+        self.frame = 0
+        self.paused = False
+        self.show()
+
+    @property
+    def other(self):
+        return self.grids[1] if len(self.grids) > 1 else None
+
+    def labels(self):
+        return [f"{t.algo}: {min(self.frame, len(t))}/{len(t)} steps" for t in self.traces]
+
+    def seek(self, frame):
+        self.frame = max(0, min(frame, self.frames))
+        self.show()
+
+    def advance(self, frames):
+        if not self.paused:
+            self.seek(self.frame + frames)
+            self.paused = self.frame == self.frames
+
+    def show(self):
+        for grid, trace in zip(self.grids, self.traces):
+            grid.cells[:] = trace.cells(self.base, self.frame).tobytes()
+
+def pick_traces(traces, algo, grid, start, end, count):
+    # Traces recorded for this start and end: the selected algorithm's
+    # first, then the most recent others
+    if not (start and end):
+        return []
+    usable = [t for t in reversed(traces.values()) if t.matches(grid, start.index, end.index)]
+    usable.sort(key=lambda t: t.algo != algo)
+    return usable[:count]
+
+# --- GRID & DRAW FUNCTIONS ---
+
+def make_grid(rows):
+    # The cell size on screen follows from the view (Viewport), not the grid
+    return Grid(rows)
+
+def draw_panel(win, stats, settings):
+    pygame.draw.rect(win, PANEL_COLOR, (GRID_WIDTH, 0, WIDTH - GRID_WIDTH, HEIGHT))
+    
+    # Header
+    title = HEADER_FONT.render("CONTROLS", 1, WHITE)
+    win.blit(title, (GRID_WIDTH + 45, 20))
+
+    # Button helper
+    def draw_button(y, text, color=(100, 100, 100), x=GRID_WIDTH + 20, w=160, h=40):
+        pygame.draw.rect(win, color, (x, y, w, h))
+        label = FONT.render(text, 1, WHITE)
+        # Center text roughly
+        text_rect = label.get_rect(center=(x + w // 2, y + h // 2))
+        win.blit(label, text_rect)
+        return pygame.Rect(x, y, w, h)
+
+    # Algo Buttons, two per row, one for each registered algorithm
+    buttons = {}
+    for k, name in enumerate(ALGORITHMS):
+        color = (0, 150, 0) if settings["algo"] == name else (100, 100, 100)
+        buttons[name] = draw_button(55 + (k // 2) * 30, name, color,
+                                    x=GRID_WIDTH + 20 + (k % 2) * 83, w=77, h=26)
+    
+    # Map Buttons
+    btn_map1 = draw_button(250, "Maze", w=77)
+    btn_map2 = draw_button(250, "Spiral", x=GRID_WIDTH + 103, w=77)
+    btn_save = draw_button(300, "Save", w=77)
+    btn_load = draw_button(300, "Load", x=GRID_WIDTH + 103, w=77)
+    btn_reset = draw_button(350, "Reset", RED, w=77)
+    btn_export = draw_button(350, "Export", x=GRID_WIDTH + 103, w=77)
+
+    # Start Button
+    btn_start = draw_button(410, "START", ORANGE, w=77)
+    btn_profile = draw_button(410, "Profile", (0, 150, 0) if settings["profile"] else (100, 100, 100),
+                              x=GRID_WIDTH + 103, w=77)
+
+    # Animation controls
+    speed = settings["speed"]
+    btn_instant = draw_button(460, "Instant", (0, 150, 0) if settings["instant"] else (100, 100, 100),
+                              w=77, h=34)
+    btn_heatmap = draw_button(460, "Heatmap", (0, 150, 0) if settings["heatmap"] else (100, 100, 100),
+                              x=GRID_WIDTH + 103, w=77, h=34)
+    speed_txt = FONT.render(f"Speed: {SPEEDS[speed] if speed < len(SPEEDS) - 1 else 'max'} steps/frame", 1, WHITE)
+    win.blit(speed_txt, (GRID_WIDTH + 20, 510))
+    slider = pygame.Rect(GRID_WIDTH + 20, 535, 160, 10)
+    pygame.draw.rect(win, (100, 100, 100), slider)
+    knob_x = slider.x + speed * slider.width // (len(SPEEDS) - 1)
+    pygame.draw.circle(win, ORANGE, (knob_x, slider.centery), 8)
+
+    # Metrics
+    pygame.draw.line(win, WHITE, (GRID_WIDTH + 10, 570), (WIDTH - 10, 570))
+    stats_title = HEADER_FONT.render("METRICS", 1, WHITE)
+    win.blit(stats_title, (GRID_WIDTH + 50, 580))
+
+    # Search time is the search alone; render and events are what the
+    # visualizer spent around it while the run was animating
+    lines = [
+        f"Search: {stats['time'] * 1000:.2f} ms",
+        f"Render: {stats['render'] * 1000:.2f} ms",
+        f"Events: {stats['events'] * 1000:.2f} ms",
+        f"Visited: {stats['visited']}" + (f" (A* {stats['baseline']})" if stats["baseline"] else ""),
+        f"Path Len: {stats['path']}",
+        f"Path Cost: {stats['cost']}",
+        f"Checks: {stats['checks']}",
+        f"Push/Pop/Stale: {stats['pushes']}/{stats['pops']}/{stats['stale']}",
+        f"Preproc: {stats['prep'] * 1000:.2f} ms",
+        f"Cache hit/miss: {stats['hits']}/{stats['misses']}",
+    ]
+    for k, line in enumerate(lines):
+        win.blit(FONT.render(line, 1, WHITE), (GRID_WIDTH + 20, 604 + k * 19))
+
+    buttons.update({
+        "Map1": btn_map1, "Map2": btn_map2, "Save": btn_save, "Load": btn_load,
+        "Reset": btn_reset, "Export": btn_export, "Start": btn_start, "Profile": btn_profile,
+        "Instant": btn_instant, "Heatmap": btn_heatmap, "Speed": slider.inflate(0, 16)
+    })
+    return buttons
+
+# --- VIEWPORT ---
+# Which part of the grid is on screen: scale is pixels per cell (below 1
+# when a big grid is zoomed out), x/y the cell at the top left corner, both
+# fractional. Clicks go through cell_at() so they hit the cell under the
+# mouse at any zoom and offset.
+class Viewport:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.rows = self.cols = 0
+        self.scale = self.min_scale = 1
+        self.x = self.y = 0
+
+    def fit(self, rows, cols):
+        # Whole grid in view, zoomed out as far as it goes
+        self.rows, self.cols = rows, cols
+        self.min_scale = self.scale = min(self.width / cols, self.height / rows)
+        self.x = self.y = 0
+
+    def key(self):
+        return self.scale, self.x, self.y
+
+    def clamp(self):
+        self.x = max(0, min(self.x, self.cols - self.width / self.scale))
+        self.y = max(0, min(self.y, self.rows - self.height / self.scale))
+
+    def zoom(self, factor, pos):
+        # The cell under pos stays under pos
+        px, py = pos
+        cx, cy = self.x + px / self.scale, self.y + py / self.scale
+        self.scale = max(self.min_scale, min(self.scale * factor, max(MAX_SCALE, self.min_scale)))
+        self.x, self.y = cx - px / self.scale, cy - py / self.scale
+        self.clamp()
+
+    def pan(self, dx, dy):
+        # Move the map by (dx, dy) pixels
+        self.x -= dx / self.scale
+        self.y -= dy / self.scale
+        self.clamp()
+
+    def cell_at(self, pos):
+        # (row, col) under a window position, None outside the map
+        px, py = pos
+        if not (0 <= px < self.width and 0 <= py < self.height):
+            return None
+        row, col = int(self.y + py / self.scale), int(self.x + px / self.scale)
+        if row < self.rows and col < self.cols:
+            return row, col
+        return None
+
+    def to_screen(self, row, col):
+        return round((col - self.x) * self.scale), round((row - self.y) * self.scale)
+
+    def visible(self):
+        # Row and column range on screen, end exclusive
+        r0, c0 = int(self.y), int(self.x)
+        r1 = min(self.rows, int(self.y + self.height / self.scale) + 1)
+        c1 = min(self.cols, int(self.x + self.width / self.scale) + 1)
+        return r0, r1, c0, c1
+
+# --- RENDERER ---
+# Draws the visible part of the grid in one go: the cell states and terrain
+# costs are combined into palette indices with NumPy, written into a small
+# 8-bit surface with pygame.surfarray (one pixel per cell) and scaled up or
+# down to the zoom level. Zoomed out past one pixel per cell, only every n-th
+# cell is looked up. The grid area is redrawn only when a cell, the heatmap
+# or the view changed since the last frame.
+#
+# For a side-by-side replay the grid area is split in two halves, each
+# drawn by a Renderer of its own (x is the left edge of its area).
+class Renderer:
+    def __init__(self, win, width, height, x=0):
+        self.win = win
+        self.area = pygame.Rect(x, 0, width, height)
+        self.view = Viewport(width, height)
+        self.grid = None
+        self.shown = None
+        self.shown_key = None
+        self.heat = None
+        self.label = None
+        self.halves = None
+        self.panel_key = None
+        self.buttons = None
+
+    def set_heatmap(self, field):
+        # field: (rows, cols) distance per cell (-1 unreachable) or None to
+        # switch off. Empty/open/closed cells are painted by distance instead
+        # of state.
+        if field is None:
+            self.heat = None
+        else:
+            levels = field * (HEAT_LEVELS - 1) // max(int(field.max()), 1)
+            self.heat = (HEAT_CODE + levels).astype(np.uint8), field >= 0
+        self.shown = None  # repaint on the next frame
+
+    def draw(self, grid, stats, settings, other=None, labels=()):
+        # other: a second grid, shown right of grid (side-by-side replay);
+        # labels: a caption for each grid shown
+        labels = list(labels) + [None, None]
+        if other is None:
+            if self.halves:
+                self.halves = None
+                self.shown = None
+            rects = self.draw_grid(grid, labels[0])
+        else:
+            if not self.halves:
+                width = self.area.width // 2
+                self.halves = [Renderer(self.win, width, self.area.height),
+                               Renderer(self.win, width, self.area.height, x=width)]
+            rects = self.halves[0].draw_grid(grid, labels[0]) + self.halves[1].draw_grid(other, labels[1])
+
+        panel_key = (tuple(settings.items()), tuple(stats.items()))
+        if panel_key != self.panel_key:
+            self.panel_key = panel_key
+            self.buttons = draw_panel(self.win, stats, settings)
+            rects.append(pygame.Rect(GRID_WIDTH, 0, WIDTH - GRID_WIDTH, HEIGHT))
+
+        if rects:
+            pygame.display.update(rects)
+        return self.buttons
+
+    def draw_grid(self, grid, label=None):
+        # Repaints the grid area if anything on it changed, returns the
+        # rectangles to update
+        if grid is not self.grid:
+            if (grid.rows, grid.cols) != (self.view.rows, self.view.cols):
+                self.view.fit(grid.rows, grid.cols)
+            self.grid = grid
+            self.shown = None
+        if (self.shown is None or self.view.key() != self.shown_key or label != self.label or
+                grid.cells != self.shown[0] or grid.costs != self.shown[1]):
+            self.shown = bytes(grid.cells), bytes(grid.costs)
+            self.shown_key = self.view.key()
+            self.label = label
+            self.render()
+            return [self.area]
+        return []
+
+    def render(self):
+        grid, view = self.grid, self.view
+        r0, r1, c0, c1 = view.visible()
+        step = max(1, math.ceil(1 / view.scale))
+        window = slice(r0, r1, step), slice(c0, c1, step)
+        cells = np.frombuffer(grid.cells, dtype=np.uint8).reshape(grid.rows, grid.cols)[window]
+        costs = np.frombuffer(grid.costs, dtype=np.uint8).reshape(grid.rows, grid.cols)[window]
+        codes = (costs << 3) | cells
+        if self.heat is not None:
+            heat, reached = self.heat[0][window], self.heat[1][window]
+            codes = np.where(reached & HEATED[cells], heat, codes)
+
+        # surfarray is indexed (x, y), the arrays (row, col)
+        surface = pygame.Surface(codes.shape[::-1], depth=8)
+        surface.set_palette(PALETTE)
+        pygame.surfarray.blit_array(surface, codes.T)
+        ox, oy = self.area.topleft
+        x0, y0 = view.to_screen(r0, c0)
+        x1, y1 = view.to_screen(r1, c1)
+        x0, y0, x1, y1 = x0 + ox, y0 + oy, x1 + ox, y1 + oy
+        self.win.set_clip(self.area)
+        self.win.fill(OUTSIDE, self.area)
+        self.win.blit(pygame.transform.scale(surface, (x1 - x0, y1 - y0)), (x0, y0))
+        if view.scale >= LINE_SCALE:
+            for row in range(r0, r1 + 1):
+                y = view.to_screen(row, c0)[1] + oy
+                pygame.draw.line(self.win, GREY, (x0, y), (x1, y))
+            for col in range(c0, c1 + 1):
+                x = view.to_screen(r0, col)[0] + ox
+                pygame.draw.line(self.win, GREY, (x, y0), (x, y1))
+        if self.label:
+            # Bottom left, where it is least likely to cover start or end
+            text = FONT.render(self.label, 1, WHITE)
+            box = text.get_rect(bottomleft=(ox + 6, oy + self.area.height - 6))
+            pygame.draw.rect(self.win, PANEL_COLOR, box.inflate(8, 4))
+            self.win.blit(text, box)
+        self.win.set_clip(None)
+
+# --- MAIN LOOP ---
+def open_window():
+    global WIN, FONT, HEADER_FONT
+    pygame.init()
+    WIN = pygame.display.set_mode((WIDTH, HEIGHT))
+    set_caption({"brush": 0, "cache": True})
+    FONT = pygame.font.SysFont('arial', 16)
+    HEADER_FONT = pygame.font.SysFont('arial', 20, bold=True)
+    return WIN
+
+def set_caption(settings):
+    # The brush is picked with the number keys: 0 draws walls, 1-9 paint
+    # terrain of that cost. C switches the path cache on and off.
+    brush = settings["brush"]
+    what = "walls" if brush == 0 else f"terrain cost {brush}"
+    cache = "on" if settings["cache"] else "off"
+    pygame.display.set_caption(f"Pathfinding Algorithm Visualizer - brush: {what} (keys 0-9) - cache: {cache} (C)")
+
+def new_stats():
+    return {"time": 0, "render": 0, "events": 0, "visited": 0, "path": 0, "cost": 0,
+            "checks": 0, "pushes": 0, "pops": 0, "stale": 0, "prep": 0, "baseline": 0,
+            "hits": 0, "misses": 0}
+
+def main(win, width, rows=ROWS):
+    grid = make_grid(rows)
+    start = None
+    end = None
+    run = True
+    started = False
+    
+    settings = {"algo": "A*", "speed": 4, "instant": False, "heatmap": False, "profile": False,
+                "brush": 0, "cache": True}
+    stats = new_stats()
+    animation = None
+    run_times = {}  # seconds in search / render / events for the current run
+    prep = 0        # seconds of preprocessing (ALT landmarks) for the current run
+    profile = None
+    runs = []       # finished runs, written out by Export
+    planner = None  # LPA* state, kept between runs while the map is edited
+    hpa = None      # HPA* abstract graph, same
+    components = None  # ComponentIndex, same
+    cache = None    # PathCache, same
+    query = None    # (algo, start, end) of the running search, cached when it is done
+    generated = 0   # maps made with G so far, also the seed of the next one
+    traces = {}     # algo -> Trace of its last run on this map, for replays
+    trace = None    # Trace of the running search
+    replay = None   # Replay being shown, grid edits are off meanwhile
+
+    renderer = Renderer(win, GRID_WIDTH, HEIGHT)
+    view = renderer.view
+    clock = pygame.time.Clock()
+
+    def edited(i, barrier):
+        # Tell the kept search state about an edit at cell i; HPA* (unit
+        # costs) and the component index only care about walls
+        for p in (planner, hpa if barrier else None, components if barrier else None, cache):
+            if p is not None:
+                p.update_cell(i)
+
+    while run:
+        clock.tick(FPS)
+
+        # Advance the running search by as many steps as fit in this frame.
+        # Instant mode computes the whole result before the next repaint.
+        running = animation is not None
+        result = None
+        if animation:
+            st = time.perf_counter()
+            searched = run_times["search"]
+            if settings["instant"]:
+                result = advance(animation, SPEEDS[-1], float("inf"))
+            else:
+                result = advance(animation, SPEEDS[settings["speed"]], FRAME_BUDGET)
+            # The rest of advance() is painting cell states
+            run_times["render"] += time.perf_counter() - st - (run_times["search"] - searched)
+            if result is not None:
+                animation = None
+                started = False
+        if replay:
+            replay.advance(SPEEDS[-1] if settings["instant"] else SPEEDS[settings["speed"]])
+
+        st = time.perf_counter()
+        buttons = renderer.draw(grid, stats, settings, replay and replay.other,
+                                replay.labels() if replay else ())
+        if running:
+            run_times["render"] += time.perf_counter() - st
+
+        st = time.perf_counter()
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                run = False
+
+            # MOUSE CLICKS
+            if pygame.mouse.get_pressed()[0]: # Left Click
+                pos = pygame.mouse.get_pos()
+                
+                # Check if click is within Grid
+                if pos[0] < GRID_WIDTH:
+                    if started or replay: continue 
+                    
+                    # Row/col under the mouse at the current zoom and offset
+                    cell = view.cell_at(pos)
+                    if cell is None: continue
+                    
+                    spot = Node(grid, *cell)
+                    was_barrier = spot.is_barrier()
+                    if not start and spot != end:
+                        # Start and end may go on a wall, which removes it
+                        start = spot
+                        start.make_start()
+                        if was_barrier:
+                            edited(spot.index, True)
+                    elif not end and spot != start:
+                        end = spot
+                        end.make_end()
+                        if was_barrier:
+                            edited(spot.index, True)
+                    elif spot != end and spot != start and settings["brush"]:
+                        # Terrain brush: paints over walls too
+                        if was_barrier:
+                            spot.reset()
+                        if was_barrier or grid.costs[spot.index] != settings["brush"]:
+                            grid.set_cost(spot.index, settings["brush"])
+                            edited(spot.index, was_barrier)
+                    elif spot != end and spot != start and not was_barrier:
+                        spot.make_barrier()
+                        edited(spot.index, True)
+                
+                # Panel Interaction
+                else:
+                    for name in ALGORITHMS:
+                        if buttons[name].collidepoint(pos): settings["algo"] = name
+                    
+                    if buttons["Speed"].collidepoint(pos):
+                        slider = buttons["Speed"]
+                        speed = round((pos[0] - slider.x) * (len(SPEEDS) - 1) / slider.width)
+                        settings["speed"] = max(0, min(len(SPEEDS) - 1, speed))
+
+                    if buttons["Reset"].collidepoint(pos):
+                        start = None
+                        end = None
+                        grid = make_grid(rows)
+                        stats = new_stats()
+                        started = False; animation = None
+                        replay = None; traces = {}
+                        renderer.set_heatmap(None)
+
+                    if buttons["Map1"].collidepoint(pos):
+                        start = None; end = None; started = False; animation = None
+                        replay = None; traces = {}
+                        grid = premade("maze", rows)
+                        renderer.set_heatmap(None)
+                    
+                    if buttons["Map2"].collidepoint(pos):
+                        start = None; end = None; started = False; animation = None
+                        replay = None; traces = {}
+                        grid = premade("spiral", rows)
+                        renderer.set_heatmap(None)
+
+                    if event.type == pygame.MOUSEBUTTONDOWN and buttons["Save"].collidepoint(pos):
+                        os.makedirs(os.path.dirname(MAP_FILE), exist_ok=True)
+                        save_map(MAP_FILE, grid, start and start.index, end and end.index)
+                        print(f"Map saved to {os.path.normpath(MAP_FILE)}")
+                        if traces:
+                            save_traces(TRACE_FILE, list(traces.values()))
+                            print(f"{len(traces)} traces saved to {os.path.normpath(TRACE_FILE)}")
+
+                    if event.type == pygame.MOUSEBUTTONDOWN and buttons["Load"].collidepoint(pos):
+                        try:
+                            loaded, s, e = load_map(MAP_FILE)
+                        except (OSError, ValueError) as err:
+                            print(f"Could not load map: {err}")
+                        else:
+                            grid = loaded
+                            start = end = None; started = False; animation = None
+                            replay = None; traces = {}
+                            if os.path.exists(TRACE_FILE):
+                                try:
+                                    traces = {t.algo: t for t in load_traces(TRACE_FILE)}
+                                    # Saved with this map, replayable until it is edited
+                                    for t in traces.values():
+                                        t.revision = (grid.version, grid.cost_version)
+                                except ValueError as err:
+                                    print(f"Could not load traces: {err}")
+                            if s is not None:
+                                start = Node(grid, *grid.pos(s)); start.make_start()
+                            if e is not None:
+                                end = Node(grid, *grid.pos(e)); end.make_end()
+                            renderer.set_heatmap(None)
+
+                    if event.type == pygame.MOUSEBUTTONDOWN and buttons["Export"].collidepoint(pos):
+                        os.makedirs(DATA_DIR, exist_ok=True)
+                        with open(METRICS_FILE, "w") as file:
+                            json.dump(runs, file, indent=2)
+                        print(f"{len(runs)} runs exported to {os.path.normpath(METRICS_FILE)}")
+
+                    if event.type == pygame.MOUSEBUTTONDOWN and buttons["Profile"].collidepoint(pos):
+                        settings["profile"] = not settings["profile"]
+
+                    if event.type == pygame.MOUSEBUTTONDOWN and buttons["Instant"].collidepoint(pos):
+                        settings["instant"] = not settings["instant"]
+
+                    if event.type == pygame.MOUSEBUTTONDOWN and buttons["Heatmap"].collidepoint(pos):
+                        settings["heatmap"] = not settings["heatmap"]
+                        # Distance from start to every cell, one vectorized BFS
+                        if settings["heatmap"] and start:
+                            renderer.set_heatmap(distance_field(grid, start.index))
+                        else:
+                            renderer.set_heatmap(None)
+
+                    if buttons["Start"].collidepoint(pos) and start and end and not started:
+                        started = True
+                        replay = None
+                        grid.clear_marks()
+                        start.make_start()
+                        end.make_end()
+                        if settings["heatmap"]:
+                            renderer.set_heatmap(distance_field(grid, start.index))
+                        # Rebuilt for a new map, or after edits nobody reported
+                        if components is None or components.grid is not grid or components.version != grid.version:
+                            components = ComponentIndex(grid)
+                        if cache is None or cache.grid is not grid:
+                            cache = PathCache(grid)
+                        run_times = {"search": 0, "render": 0, "events": 0}
+                        prep = 0
+                        steps = None
+                        query = None
+                        trace = None
+                        connected = components.connected(start.index, end.index)
+                        cached = None
+                        if connected and settings["cache"]:
+                            cached = cache.get(settings["algo"], start.index, end.index)
+                        if not connected:
+                            # Walled off from each other: no path, without searching
+                            print("No path: start and end are not connected")
+                            result = SearchResult()
+                            result.unreachable = True
+                            started = False
+                        elif cached is not None:
+                            # Asked before, or answered by the tree of this start
+                            for i in cached.path[1:-1]:
+                                grid.cells[i] = PATH
+                            result = cached
+                            started = False
+                        elif settings["algo"] == "LPA*":
+                            # Reuse the planner so only the edited part is repaired
+                            if (not planner or planner.grid is not grid or
+                                    planner.start != start.index or planner.end != end.index):
+                                planner = LPAStar(grid, start.index, end.index)
+                            steps = planner.steps()
+                        elif settings["algo"] == "HPA*":
+                            if not hpa or hpa.grid is not grid:
+                                hpa = HPAStar(grid)
+                            steps = hpa.steps(start.index, end.index)
+                        else:
+                            if settings["algo"] == "ALT":
+                                # Landmarks outside the timed search, shown as preprocessing
+                                prep = landmarks_for(grid).build_time
+                            steps = ALGORITHMS[settings["algo"]](grid, start.index, end.index)
+                        if steps is not None:
+                            if settings["cache"]:
+                                query = settings["algo"], start.index, end.index
+                            profile = cProfile.Profile() if settings["profile"] else None
+                            if profile:
+                                steps = profiled(steps, profile)
+                            trace = Trace(settings["algo"], grid.rows, grid.cols, start.index, end.index,
+                                          (grid.version, grid.cost_version))
+                            animation = animate(timed(steps, run_times), grid, start, end, trace)
+
+            elif pygame.mouse.get_pressed()[2]: # Right Click (Delete)
+                pos = pygame.mouse.get_pos()
+                cell = view.cell_at(pos)
+                if cell and not started and not replay:
+                    spot = Node(grid, *cell)
+                    was_barrier = spot.is_barrier()
+                    was_weighted = grid.costs[spot.index] != MIN_COST
+                    spot.reset()
+                    grid.set_cost(spot.index, MIN_COST)
+                    if was_barrier or was_weighted:
+                        edited(spot.index, was_barrier)
+                    if spot == start:
+                        start = None
+                    elif spot == end:
+                        end = None
+
+            # VIEWPORT: wheel zooms at the mouse, middle drag pans
+            if event.type == pygame.MOUSEWHEEL:
+                pos = pygame.mouse.get_pos()
+                if pos[0] < GRID_WIDTH:
+                    view.zoom(ZOOM_STEP ** event.y, pos)
+            if event.type == pygame.MOUSEMOTION and pygame.mouse.get_pressed()[1]:
+                view.pan(*event.rel)
+
+            # KEYBOARD
+            if event.type == pygame.KEYDOWN:
+                # Arrow keys pan, F fits the whole grid in view
+                arrows = {pygame.K_LEFT: (1, 0), pygame.K_RIGHT: (-1, 0),
+                          pygame.K_UP: (0, 1), pygame.K_DOWN: (0, -1)}
+                if event.key in arrows:
+                    dx, dy = arrows[event.key]
+                    view.pan(dx * PAN_STEP * view.width, dy * PAN_STEP * view.height)
+                if event.key == pygame.K_f:
+                    view.fit(grid.rows, grid.cols)
+                # Replays: R the selected algorithm's last run, V it and the
+                # latest other one side by side. Space pauses, , and . step
+                # back and forward (by the speed setting), Home/End jump,
+                # Escape leaves the replay.
+                if event.key in (pygame.K_r, pygame.K_v) and not started:
+                    picked = pick_traces(traces, settings["algo"], grid, start, end,
+                                         2 if event.key == pygame.K_v else 1)
+                    if event.key == pygame.K_v and len(picked) < 2:
+                        print("Side by side needs runs of two algorithms with this start and end")
+                    elif not picked:
+                        print("Nothing to replay: no run with this start and end since the map was last edited")
+                    else:
+                        replay = Replay(grid, picked)
+                if replay:
+                    step = SPEEDS[settings["speed"]]
+                    if event.key == pygame.K_SPACE:
+                        replay.paused = not replay.paused
+                    elif event.key in (pygame.K_COMMA, pygame.K_PERIOD, pygame.K_HOME, pygame.K_END):
+                        replay.paused = True
+                        replay.seek({pygame.K_COMMA: replay.frame - step, pygame.K_PERIOD: replay.frame + step,
+                                     pygame.K_HOME: 0, pygame.K_END: replay.frames}[event.key])
+                    elif event.key == pygame.K_ESCAPE:
+                        replay.seek(replay.frames)
+                        replay = None
+                if pygame.K_0 <= event.key <= pygame.K_9:
+                    settings["brush"] = event.key - pygame.K_0
+                    set_caption(settings)
+                if event.key == pygame.K_c:
+                    settings["cache"] = not settings["cache"]
+                    set_caption(settings)
+                if event.key == pygame.K_g:
+                    # A fresh seeded map of the next generator family, at the current size
+                    family = GENERATED[generated % len(GENERATED)]
+                    grid = premade(family, rows, seed=generated)
+                    print(f"Generated {family} map, seed {generated}")
+                    generated += 1
+                    start = None; end = None; started = False; animation = None
+                    replay = None; traces = {}
+                    renderer.set_heatmap(None)
+
+        if running:
+            run_times["events"] += time.perf_counter() - st
+
+        if result is not None:
+            # ALT: what plain A* expands on the same query, for comparison
+            baseline = 0
+            if settings["algo"] == "ALT" and not (result.unreachable or result.cached):
+                baseline = astar(grid, start.index, end.index).visited
+            stats = {"time": run_times["search"], "render": run_times["render"],
+                     "events": run_times["events"], "visited": result.visited,
+                     "path": result.path_len, "cost": grid.path_cost(result.path), "checks": result.neighbor_checks,
+                     "pushes": result.pushes, "pops": result.pops, "stale": result.stale_pops,
+                     "prep": prep, "baseline": baseline,
+                     "hits": cache.hits if cache is not None else 0,
+                     "misses": cache.misses if cache is not None else 0}
+            runs.append({"algo": settings["algo"], "rows": grid.rows, "cols": grid.cols,
+                         "start": start.index if start else None, "end": end.index if end else None,
+                         **result.as_dict(), "path_cost": grid.path_cost(result.path),
+                         "seconds": dict(run_times, preprocess=prep)})
+            if query:
+                cache.put(*query, result)
+                query = None
+            if trace is not None:
+                # Latest run last, pick_traces() goes by that order
+                traces.pop(trace.algo, None)
+                traces[trace.algo] = trace
+                trace = None
+            if profile:
+                os.makedirs(DATA_DIR, exist_ok=True)
+                profile.dump_stats(PROFILE_FILE)
+                pstats.Stats(profile).sort_stats("tottime").print_stats(10)
+                profile = None
+
+    pygame.quit()
+
+def launch(rows=None):
+    main(open_window(), WIDTH, rows or ROWS)
+
+if __name__ == "__main__":
+    launch()